@@ -8,6 +8,15 @@ import xarray as xr
 import io
 from typing import List, Optional, Dict
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from functools import lru_cache
+
+# httpx (with the h2 extra) lets concurrent calls share one HTTP/2 connection; optional
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
 # Model configurations
 MODELS = ["gso", "access-g", "access-ge", "access-ce"]
@@ -15,18 +24,49 @@ CE_DOMAINS = ["adelaide", "brisbane", "sydney", "darwin", "canberra", "hobart",
 DEFAULT_GSO_DOMAIN = "australia"
 DEFAULT_CE_DOMAIN = "brisbane"
 
+# Shared session so metadata/extract calls (including concurrent ones) reuse pooled
+# keep-alive connections instead of a new TLS handshake per request.
+# Retry only applies to idempotent methods, so extract POSTs are not replayed, and the
+# final response is returned (raise_on_status=False) so the status checks below still apply.
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504], raise_on_status=False)
+))
+
+
+@lru_cache(maxsize=1)
+def _get_http2_client():
+    """Return a shared HTTP/2 httpx client, or None if httpx/h2 are not installed"""
+    if httpx is None:
+        return None
+    try:
+        return httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            timeout=30
+        )
+    except ImportError:
+        # httpx is installed without the h2 package
+        return None
+
 
 class AWSAPIClient:
     """Client for AWS weather API with authentication"""
     
-    def __init__(self, base_url: str, id_token: str):
+    def __init__(self, base_url: str, id_token: str, transport: str = 'requests'):
         """
         Initialize AWS API client
         
         Args:
             base_url: Base URL for the API (e.g., https://...amazonaws.com/prod)
             id_token: AWS Cognito ID token for authentication
+            transport: 'requests' (default) or 'httpx' for HTTP/2; falls back to
+                       requests if httpx[http2] is not installed
         """
+        http2_client = _get_http2_client() if transport == 'httpx' else None
+        self._http = http2_client if http2_client is not None else _SESSION
         self.base_url = base_url.rstrip('/')
         self.id_token = id_token
         self.headers = {
@@ -55,7 +95,7 @@ class AWSAPIClient:
         elif model == "gso" and domain:
             params["domain"] = domain or DEFAULT_GSO_DOMAIN
         
-        response = requests.get(url, headers=self.headers, params=params, timeout=30)
+        response = self._http.get(url, headers=self.headers, params=params, timeout=30)
         
         if response.status_code == 401:
             raise PermissionError("Unauthorized: token expired or invalid")
@@ -121,7 +161,7 @@ class AWSAPIClient:
         elif model == "gso":
             payload["domain"] = domain or DEFAULT_GSO_DOMAIN
         
-        response = requests.post(url, json=payload, headers=self.headers, timeout=60)
+        response = self._http.post(url, json=payload, headers=self.headers, timeout=60)
         
         if response.status_code == 401:
             raise PermissionError("Unauthorized: token expired or invalid")
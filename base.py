@@ -5,6 +5,13 @@ from abc import ABC, abstractmethod
 import pandas as pd
 from typing import List, Dict, Any
 
+
+def ensure_datetime(values: pd.Series) -> pd.Series:
+    """Return values as datetime64, skipping the conversion if they already are"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    return pd.to_datetime(values, errors='coerce')
+
 class DataSource(ABC):
     """Abstract base class for weather data sources"""
     
@@ -3,8 +3,11 @@
 """AWS API data source (GSO, ACCESS-G, ACCESS-GE, ACCESS-CE models)"""
 
 import pandas as pd
+import numpy as np
 import streamlit as st
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime
 import xarray as xr
 import sys
@@ -13,9 +16,31 @@ import os
 # Add parent directory to path to import aws_api_extract
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from base import DataSource
+from base import DataSource, ensure_datetime
 from aws_api_extract import AWSAPIClient, get_data_for_point, MODELS, CE_DOMAINS, DEFAULT_CE_DOMAIN
 
+# Models served for each forecast type (gso is available as both)
+_DET_MODELS = ('gso', 'access-g')
+_ENS_MODELS = ('gso', 'access-ge', 'access-ce')
+
+
+@lru_cache(maxsize=64)
+def _fetch_model_variables(base_url: str, id_token: str, model: str, domain: Optional[str]) -> Tuple[str, ...]:
+    """
+    Fetch available variables for a model, cached for the life of the process
+    
+    The data source is rebuilt on every Streamlit rerun, so the cache lives at
+    module level. Keyed on the token so a new login never reuses stale metadata.
+    """
+    client = AWSAPIClient(base_url, id_token)
+    return tuple(client.get_available_variables(model, domain))
+
+
+def _flush_warnings(messages: List[str]):
+    """Show collected warnings once each, in the order they were raised"""
+    for message in dict.fromkeys(messages):
+        st.warning(message)
+
 
 class AWSAPIDataSource(DataSource):
     """Data source for AWS API weather models (GSO, ACCESS-G, ACCESS-GE, ACCESS-CE)"""
@@ -34,32 +59,33 @@ class AWSAPIDataSource(DataSource):
         self.id_token = id_token
         self.default_domain = domain or DEFAULT_CE_DOMAIN
         self.client = AWSAPIClient(base_url, id_token)
-        
-        # Cache for metadata by model and domain
-        self._metadata_cache = {}
     
-    def _get_model_variables(self, model: str, domain: Optional[str] = None) -> List[str]:
+    def _get_model_variables(
+        self,
+        model: str,
+        domain: Optional[str] = None,
+        warnings_local: Optional[List[str]] = None
+    ) -> List[str]:
         """
         Fetch available variables for a model from metadata endpoint
         
         Args:
             model: Model name
             domain: Domain (for access-ce or gso)
+            warnings_local: Optional list to collect warnings in instead of showing them
         
         Returns:
             List of available variable names
         """
-        cache_key = f"{model}_{domain or 'default'}"
-        
-        if cache_key not in self._metadata_cache:
-            try:
-                variables = self.client.get_available_variables(model, domain)
-                self._metadata_cache[cache_key] = variables
-            except Exception as e:
-                st.warning(f"Failed to fetch metadata for {model}: {str(e)}")
-                return []
-        
-        return self._metadata_cache[cache_key]
+        try:
+            return list(_fetch_model_variables(self.base_url, self.id_token, model, domain))
+        except Exception as e:
+            message = f"Failed to fetch metadata for {model}: {str(e)}"
+            if warnings_local is None:
+                st.warning(message)
+            else:
+                warnings_local.append(message)
+            return []
     
     def _dataset_to_dataframe(self, ds: xr.Dataset, model: str, is_ensemble: bool = False) -> pd.DataFrame:
         """
@@ -73,22 +99,33 @@ class AWSAPIDataSource(DataSource):
         Returns:
             DataFrame with datetime, variable columns, and optional member column
         """
+        # Nothing to convert if the API returned no variables or an empty dimension
+        if not ds.data_vars or any(size == 0 for size in ds.sizes.values()):
+            return pd.DataFrame()
+        
+        # Find the time and ensemble dimension names
+        time_dim = next((d for d in ['time', 'valid_time', 'forecast_time', 'datetime'] if d in ds.sizes), None)
+        ens_dim = next((d for d in ['member', 'ensemble', 'number'] if d in ds.sizes), None)
+        
+        # Drop singleton point dimensions and scalar coords (e.g. lat/lon) so they
+        # aren't materialized as constant columns
+        point_dims = [d for d, size in ds.sizes.items() if size == 1 and d not in (time_dim, ens_dim)]
+        if point_dims:
+            ds = ds.squeeze(point_dims, drop=True)
+        ds = ds.drop_vars([name for name, coord in ds.coords.items() if coord.ndim == 0])
+        
+        dim_order = [d for d in (time_dim, ens_dim) if d]
+        dim_order += [d for d in ds.sizes if d not in dim_order]
+        
         # Check for ensemble dimension
-        has_ensemble = 'member' in ds.dims or 'ensemble' in ds.dims or 'number' in ds.dims
+        has_ensemble = ens_dim is not None
         
         if has_ensemble:
-            # Find the ensemble dimension name
-            ens_dim = None
-            for dim_name in ['member', 'ensemble', 'number']:
-                if dim_name in ds.dims:
-                    ens_dim = dim_name
-                    break
-            
             # Convert to dataframe with multi-index
-            df = ds.to_dataframe().reset_index()
+            df = ds.to_dataframe(dim_order=dim_order).reset_index()
             
             # Rename ensemble dimension to 'member'
-            if ens_dim and ens_dim != 'member':
+            if ens_dim != 'member':
                 df = df.rename(columns={ens_dim: 'member'})
             
             # Find time column
@@ -103,32 +140,40 @@ class AWSAPIDataSource(DataSource):
             
             # Ensure datetime is datetime64
             if 'datetime' in df.columns:
-                df['datetime'] = pd.to_datetime(df['datetime'])
+                df['datetime'] = ensure_datetime(df['datetime'])
             
             # For ensemble plotting, pivot to wide format
             # Expected format: variable_model_member_XX columns
             if is_ensemble and 'member' in df.columns:
                 # Get variable columns (excluding datetime, member, model)
-                var_cols = [col for col in df.columns if col not in ['datetime', 'member', 'model', 'lat', 'lon', 'latitude', 'longitude']]
+                var_cols = df.columns.difference(
+                    ['datetime', 'member', 'model', 'lat', 'lon', 'latitude', 'longitude'], sort=False
+                ).tolist()
                 
                 if var_cols and 'datetime' in df.columns:
-                    # Pivot each variable
-                    result_df = df[['datetime']].drop_duplicates().reset_index(drop=True)
+                    # Index by (datetime, member) and unstack all variables in one pass
+                    idx = pd.MultiIndex.from_arrays(
+                        [df['datetime'].values, df['member'].values],
+                        names=('datetime', 'member')
+                    )
+                    
+                    # Ensemble members don't need FP64 precision for plotting
+                    values = df[var_cols].astype(
+                        {var: np.float32 for var in var_cols if pd.api.types.is_float_dtype(df[var])}
+                    )
+                    values.index = idx
+                    
+                    # Repeated (datetime, member) pairs keep each variable's first non-null
+                    # value, like pivot_table(aggfunc='first'); only needed when there are any
+                    if idx.has_duplicates:
+                        values = values.groupby(level=['datetime', 'member'], sort=False).first()
+                    
+                    wide = values.unstack('member')
+                    
+                    # Rename columns to match expected format: variable_model_member_XX
+                    wide.columns = [f'{var}_{model}_member_{str(member).zfill(2)}' for var, member in wide.columns]
                     
-                    for var in var_cols:
-                        # Create pivot with datetime as index and member as columns
-                        pivot_df = df.pivot_table(
-                            index='datetime',
-                            columns='member',
-                            values=var,
-                            aggfunc='first'
-                        )
-                        
-                        # Rename columns to match expected format: variable_model_member_XX
-                        pivot_df.columns = [f'{var}_{model}_member_{str(col).zfill(2)}' for col in pivot_df.columns]
-                        
-                        # Merge with result
-                        result_df = result_df.merge(pivot_df.reset_index(), on='datetime', how='outer')
+                    result_df = wide.reset_index()
                     
                     # Add model column
                     result_df['model'] = model
@@ -139,7 +184,7 @@ class AWSAPIDataSource(DataSource):
             df['model'] = model
             return df
         else:
-            df = ds.to_dataframe().reset_index()
+            df = ds.to_dataframe(dim_order=dim_order).reset_index()
             
             # Find time column
             time_col = None
@@ -153,77 +198,134 @@ class AWSAPIDataSource(DataSource):
             
             # Ensure datetime is datetime64
             if 'datetime' in df.columns:
-                df['datetime'] = pd.to_datetime(df['datetime'])
+                df['datetime'] = ensure_datetime(df['datetime'])
             
             # Add model column
             df['model'] = model
             
             return df
     
-    def get_deterministic_data(
+    def _resolve_domain(self, model: str, domain: Optional[str] = None) -> Optional[str]:
+        """
+        Resolve the domain to query for a model
+        
+        Args:
+            model: Model name
+            domain: Explicit domain (gso always uses australia)
+        
+        Returns:
+            Domain name, or None for models without domains
+        """
+        if model == 'gso':
+            return 'australia'
+        if model == 'access-ce':
+            # Check session state for domain selection
+            return domain or st.session_state.get('aws_domain', self.default_domain)
+        return domain
+    
+    def _fetch_model(
+        self,
+        model: str,
+        domain: Optional[str],
+        lat: float,
+        lon: float,
+        variables: List[str],
+        is_ensemble: bool
+    ) -> Tuple[Optional[pd.DataFrame], List[str]]:
+        """
+        Fetch and convert data for a single model
+        
+        Runs in a worker thread, so warnings are returned rather than shown.
+        
+        Returns:
+            Tuple of (DataFrame or None, list of warning messages)
+        """
+        warnings_local = []
+        
+        try:
+            # Get available variables from metadata
+            available_vars = self._get_model_variables(model, domain, warnings_local)
+            
+            if not available_vars:
+                warnings_local.append(f"No variables available for {model}")
+                return None, warnings_local
+            
+            # Use requested variables that are available, or all if none specified
+            if variables:
+                api_variables = [v for v in variables if v in available_vars]
+            else:
+                api_variables = available_vars
+            
+            if not api_variables:
+                warnings_local.append(f"None of the requested variables are available for {model}")
+                return None, warnings_local
+            
+            # Get data
+            ds = self.client.extract_point_data(
+                model=model,
+                lon=lon,
+                lat=lat,
+                variables=api_variables,
+                domain=domain
+            )
+            
+            if ds is None or not ds.data_vars:
+                return None, warnings_local
+            
+            # Convert to DataFrame (ensemble format pivots members to columns)
+            return self._dataset_to_dataframe(ds, model, is_ensemble=is_ensemble), warnings_local
+        
+        except Exception as e:
+            warnings_local.append(f"Failed to fetch {model}: {str(e)}")
+            return None, warnings_local
+    
+    def _get_data(
         self,
         lat: float,
         lon: float,
         site: str,
         variables: List[str],
         data_type: str,
-        models: List[str]
+        models: List[str],
+        is_ensemble: bool
     ) -> pd.DataFrame:
-        """Get deterministic forecast data"""
+        """Fetch deterministic or ensemble data for the requested models in parallel"""
         
-        # Filter to deterministic models only (gso is also available as deterministic)
-        det_models = [m for m in models if m in ['gso', 'access-g']]
+        supported = _ENS_MODELS if is_ensemble else _DET_MODELS
+        selected_models = [m for m in models if m in supported]
         
-        if not det_models:
+        if not selected_models:
             return pd.DataFrame()
         
-        all_dfs = []
+        # Resolve domains up front - session state is only safe on the main thread
+        domains = [self._resolve_domain(model) for model in selected_models]
         
-        for model in det_models:
-            try:
-                # Determine domain
-                domain = None
-                if model == 'gso':
-                    domain = 'australia'
-                
-                # Get available variables from metadata
-                available_vars = self._get_model_variables(model, domain)
-                
-                if not available_vars:
-                    st.warning(f"No variables available for {model}")
-                    continue
-                
-                # Use requested variables that are available, or all if none specified
-                if variables:
-                    api_variables = [v for v in variables if v in available_vars]
-                else:
-                    api_variables = available_vars
-                
-                if not api_variables:
-                    st.warning(f"None of the requested variables are available for {model}")
-                    continue
-                
-                # Get data
-                ds = self.client.extract_point_data(
-                    model=model,
-                    lon=lon,
-                    lat=lat,
-                    variables=api_variables,
-                    domain=domain
-                )
-                
-                # Convert to DataFrame (deterministic format)
-                df = self._dataset_to_dataframe(ds, model, is_ensemble=False)
-                all_dfs.append(df)
-                
-            except Exception as e:
-                st.warning(f"Failed to fetch {model}: {str(e)}")
-                continue
+        with ThreadPoolExecutor(max_workers=len(selected_models)) as executor:
+            results = list(executor.map(
+                lambda model, domain: self._fetch_model(model, domain, lat, lon, variables, is_ensemble),
+                selected_models,
+                domains
+            ))
+        
+        all_dfs = [df for df, _ in results if df is not None]
+        _flush_warnings([message for _, messages in results for message in messages])
         
         if all_dfs:
             return pd.concat(all_dfs, ignore_index=True)
         return pd.DataFrame()
     
+    def get_deterministic_data(
+        self,
+        lat: float,
+        lon: float,
+        site: str,
+        variables: List[str],
+        data_type: str,
+        models: List[str]
+    ) -> pd.DataFrame:
+        """Get deterministic forecast data"""
+        return self._get_data(lat, lon, site, variables, data_type, models, is_ensemble=False)
+    
     def get_ensemble_data(
         self,
         lat: float,
@@ -234,69 +336,14 @@ class AWSAPIDataSource(DataSource):
         models: List[str]
     ) -> pd.DataFrame:
         """Get ensemble forecast data"""
-        
-        # Filter to ensemble models only (gso can also be used as ensemble)
-        ens_models = [m for m in models if m in ['gso', 'access-ge', 'access-ce']]
-        
-        if not ens_models:
-            return pd.DataFrame()
-        
-        all_dfs = []
-        
-        for model in ens_models:
-            try:
-                # Determine domain (CE requires domain)
-                domain = None
-                if model == 'access-ce':
-                    # Check session state for domain selection
-                    domain = st.session_state.get('aws_domain', self.default_domain)
-                elif model == 'gso':
-                    domain = 'australia'
-                
-                # Get available variables from metadata
-                available_vars = self._get_model_variables(model, domain)
-                
-                if not available_vars:
-                    st.warning(f"No variables available for {model}")
-                    continue
-                
-                # Use requested variables that are available, or all if none specified
-                if variables:
-                    api_variables = [v for v in variables if v in available_vars]
-                else:
-                    api_variables = available_vars
-                
-                if not api_variables:
-                    st.warning(f"None of the requested variables are available for {model}")
-                    continue
-                
-                # Get data
-                ds = self.client.extract_point_data(
-                    model=model,
-                    lon=lon,
-                    lat=lat,
-                    variables=api_variables,
-                    domain=domain
-                )
-                
-                # Convert to DataFrame (ensemble format - pivot members to columns)
-                df = self._dataset_to_dataframe(ds, model, is_ensemble=True)
-                all_dfs.append(df)
-                
-            except Exception as e:
-                st.warning(f"Failed to fetch {model}: {str(e)}")
-                continue
-        
-        if all_dfs:
-            return pd.concat(all_dfs, ignore_index=True)
-        return pd.DataFrame()
+        return self._get_data(lat, lon, site, variables, data_type, models, is_ensemble=True)
     
     def get_available_models(self, forecast_type: str = "deterministic") -> List[str]:
         """Get list of available models"""
         if forecast_type == "deterministic":
-            return ["gso", "access-g"]
+            return list(_DET_MODELS)
         elif forecast_type == "ensemble":
-            return ["gso", "access-ge", "access-ce"]
+            return list(_ENS_MODELS)
         else:
             return MODELS
     
@@ -307,21 +354,19 @@ class AWSAPIDataSource(DataSource):
         Returns union of all variables from all models
         """
         all_vars = set()
+        warnings_local = []
         
         # Get variables from all models
         for model in MODELS:
             try:
-                domain = None
-                if model == 'access-ce':
-                    domain = st.session_state.get('aws_domain', self.default_domain)
-                elif model == 'gso':
-                    domain = 'australia'
-                
-                vars_list = self._get_model_variables(model, domain)
+                domain = self._resolve_domain(model)
+                vars_list = self._get_model_variables(model, domain, warnings_local)
                 all_vars.update(vars_list)
             except Exception:
                 continue
         
+        _flush_warnings(warnings_local)
+        
         return sorted(list(all_vars))
     
     def get_model_specific_variables(self, model: str, forecast_type: str = 'deterministic', domain: str = None) -> List[str]:
@@ -337,10 +382,7 @@ class AWSAPIDataSource(DataSource):
             List of variable names available for this model
         """
         # Use appropriate domain
-        if model == 'gso':
-            domain = 'australia'
-        elif model == 'access-ce' and not domain:
-            domain = st.session_state.get('aws_domain', self.default_domain)
+        domain = self._resolve_domain(model, domain)
         
         try:
             return self._get_model_variables(model, domain)
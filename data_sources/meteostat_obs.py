@@ -130,6 +130,12 @@ class MeteostatObsDataSource(DataSource):
         # Convert units if necessary
         df = self._convert_units(df)
         
+        # Narrow float64 columns to float32 - observation precision doesn't need FP64
+        # and it halves the memory moved by plotting downstream
+        float_cols = df.select_dtypes(include='float64').columns
+        if len(float_cols) > 0:
+            df[float_cols] = df[float_cols].astype('float32', copy=False)
+        
         # Select only requested columns plus metadata
         metadata_cols = ['datetime', 'site', 'model']
         available_vars = [v for v in requested_variables if v in df.columns]
@@ -3,13 +3,35 @@
 """Open-Meteo data source implementation"""
 import pandas as pd
 from typing import List
-from base import DataSource
+from base import DataSource, ensure_datetime
 import om_extract
 import streamlit as st
+from config import BASE_HOURLY_PARAMS, DAILY_PARAMS
+
+# Ensemble fetchers, falling back to the deterministic ones if om_extract lacks them.
+# Module attributes don't change at runtime, so resolve them once at import.
+_ENSEMBLE_HOURLY = getattr(om_extract, 'getEnsembleData', om_extract.getData)
+_ENSEMBLE_DAILY = getattr(om_extract, 'getDailyEnsembleData', om_extract.getDailyData)
+
+def _standardize_datetime(df: pd.DataFrame) -> pd.DataFrame:
+    """Move the time index returned by om_extract into a 'datetime' column"""
+    if not df.empty:
+        if isinstance(df.index, pd.DatetimeIndex):
+            # Name the index 'datetime' so reset_index produces the column directly
+            df = df.rename_axis('datetime').reset_index()
+        
+        # Ensure datetime column is properly typed (no-op if already datetime64)
+        if 'datetime' in df.columns:
+            df['datetime'] = ensure_datetime(df['datetime'])
+    
+    return df
 
 class OpenMeteoDataSource(DataSource):
     """Open-Meteo forecast data source"""
     
+    # Open-Meteo exposes the same variable lists for every model, so resolve them once
+    _VARIABLES = {'hourly': BASE_HOURLY_PARAMS, 'daily': DAILY_PARAMS}
+    
     def __init__(self):
         super().__init__(name="Open-Meteo", supports_ensemble=True)
         
@@ -30,15 +52,15 @@ class OpenMeteoDataSource(DataSource):
     @staticmethod
     @st.cache_data(ttl=3600, show_spinner=False)
     def _fetch_deterministic_cached(lat, lon, site, variables, data_type, models):
-        """Cached data fetching to avoid repeated API calls"""
-        lat_list = [str(lat)]
-        lon_list = [str(lon)]
-        site_list = [site]
-        
+        """Cached data fetching to avoid repeated API calls (caches the standardized frame)"""
+        # Single site: pass scalars straight through to the fast path
         if data_type == 'hourly':
-            return om_extract.getData(lat_list, lon_list, site_list, variables=list(variables), models=list(models))
+            df = om_extract.getData(str(lat), str(lon), site, variables=list(variables), models=list(models))
         else:  # daily
-            return om_extract.getDailyData(lat_list, lon_list, site_list, variables=list(variables), models=list(models))
+            df = om_extract.getDailyData(str(lat), str(lon), site, variables=list(variables), models=list(models))
+        
+        # Standardize: om_extract returns time as index, but we need 'datetime' column
+        return _standardize_datetime(df)
     
     def get_deterministic_data(
         self, 
@@ -58,42 +80,21 @@ class OpenMeteoDataSource(DataSource):
             tuple(models)  # Convert to tuple for hashing
         )
         
-        # Standardize: om_extract returns time as index, but we need 'datetime' column
-        if not df.empty:
-            if isinstance(df.index, pd.DatetimeIndex):
-                df = df.reset_index()
-                # Rename the index column to 'datetime'
-                if 'time' in df.columns:
-                    df = df.rename(columns={'time': 'datetime'})
-                elif 'index' in df.columns:
-                    df = df.rename(columns={'index': 'datetime'})
-            
-            # Ensure datetime column exists and is properly typed
-            if 'datetime' in df.columns:
-                df['datetime'] = pd.to_datetime(df['datetime'])
-        
         return df
     
     @staticmethod
     @st.cache_data(ttl=1800, show_spinner=False)
     def _fetch_ensemble_cached(lat, lon, site, variables, data_type, models):
-        """Cached ensemble data fetching"""
+        """Cached ensemble data fetching (caches the standardized frame)"""
         lat_list = [str(lat)]
         lon_list = [str(lon)]
         site_list = [site]
         
-        if data_type == 'hourly':
-            # You may need to create getEnsembleData in om_extract module
-            if hasattr(om_extract, 'getEnsembleData'):
-                return om_extract.getEnsembleData(lat_list, lon_list, site_list, variables=list(variables), models=list(models))
-            else:
-                # Fallback to regular getData
-                return om_extract.getData(lat_list, lon_list, site_list, variables=list(variables), models=list(models))
-        else:  # daily
-            if hasattr(om_extract, 'getDailyEnsembleData'):
-                return om_extract.getDailyEnsembleData(lat_list, lon_list, site_list, variables=list(variables), models=list(models))
-            else:
-                return om_extract.getDailyData(lat_list, lon_list, site_list, variables=list(variables), models=list(models))
+        fetch = _ENSEMBLE_HOURLY if data_type == 'hourly' else _ENSEMBLE_DAILY
+        df = fetch(lat_list, lon_list, site_list, variables=list(variables), models=list(models))
+        
+        # Standardize: om_extract returns time as index, but we need 'datetime' column
+        return _standardize_datetime(df)
     
     def get_ensemble_data(
         self, 
@@ -114,20 +115,6 @@ class OpenMeteoDataSource(DataSource):
             tuple(models)  # Convert to tuple for hashing
         )
         
-        # Standardize: om_extract returns time as index, but we need 'datetime' column
-        if not df.empty:
-            if isinstance(df.index, pd.DatetimeIndex):
-                df = df.reset_index()
-                # Rename the index column to 'datetime'
-                if 'time' in df.columns:
-                    df = df.rename(columns={'time': 'datetime'})
-                elif 'index' in df.columns:
-                    df = df.rename(columns={'index': 'datetime'})
-            
-            # Ensure datetime column exists and is properly typed
-            if 'datetime' in df.columns:
-                df['datetime'] = pd.to_datetime(df['datetime'])
-        
         return df
     
     def get_available_models(self, forecast_type: str = 'deterministic') -> List[str]:
@@ -139,11 +126,7 @@ class OpenMeteoDataSource(DataSource):
     
     def get_available_variables(self, data_type: str = 'hourly') -> List[str]:
         """Return list of available variables"""
-        from config import BASE_HOURLY_PARAMS, DAILY_PARAMS
-        if data_type == 'hourly':
-            return BASE_HOURLY_PARAMS
-        else:
-            return DAILY_PARAMS
+        return self._VARIABLES['hourly' if data_type == 'hourly' else 'daily']
     
     def get_model_specific_variables(self, model: str, forecast_type: str = 'deterministic', domain: str = None) -> List[str]:
         """
@@ -5,6 +5,10 @@
 from meteostat import Stations, Hourly
 from datetime import datetime, timedelta
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+# Cap on locations fetched concurrently in main()
+MAX_WORKERS = 8
 
 
 def get_nearest_stations(lat, lon, num_stations=1):
@@ -28,63 +32,88 @@ def get_hourly_weather(station_ids, stations_info, previous_days=1, timezone='UT
     end = datetime.now()
     start = end - timedelta(days=previous_days)
 
-    data_frames = []
+    # Decide once whether a conversion is needed
+    # Note: 'GMT' and 'UTC' are effectively the same
+    target_tz_is_utc = timezone in ('UTC', 'GMT')
+    
+    # Fetch every station in one call (Meteostat loads them in parallel internally)
+    # Fetch only observation data (model=False excludes model/forecast data)
+    data = Hourly(list(station_ids), start, end, model=False).fetch()
     
-    for station_id in station_ids:
-        # Fetch only observation data (model=False excludes model/forecast data)
-        data = Hourly(station_id, start, end, model=False).fetch()
+    if not data.empty:
+        # Multiple stations come back indexed by (station, time); a single station by time only
+        if 'station' in data.index.names:
+            ids = data.index.get_level_values('station')
+            data = data.droplevel('station')
+        else:
+            ids = pd.Index([station_ids[0]]).repeat(len(data))
+        
+        # Ensure the index is timezone-aware (Meteostat returns UTC)
+        if data.index.tz is None:
+            data.index = data.index.tz_localize('UTC')
         
-        if not data.empty:
-            # Ensure the index is timezone-aware (Meteostat returns UTC)
-            if data.index.tz is None:
-                data.index = data.index.tz_localize('UTC')
-            
-            # Convert to the selected timezone if not UTC/GMT
-            # Note: 'GMT' and 'UTC' are effectively the same
-            if timezone not in ['UTC', 'GMT']:
-                try:
-                    data.index = data.index.tz_convert(timezone)
-                except Exception as e:
-                    # Keep as UTC if conversion fails
-                    pass
-            
-            station_info = stations_info.loc[station_id]
-            data["station_name"] = station_info["name"]
-            data["station_lat"] = station_info["latitude"]
-            data["station_lon"] = station_info["longitude"]
-            data["station_id"] = station_id  # Add station ID to data
-            data_frames.append(data)
+        # Convert to the selected timezone if not UTC/GMT
+        if not target_tz_is_utc:
+            try:
+                data.index = data.index.tz_convert(timezone)
+            except Exception as e:
+                # Keep as UTC if conversion fails
+                pass
+        
+        # Look up station metadata for every row at once rather than per station
+        info = stations_info[['name', 'latitude', 'longitude']].reindex(ids)
+        return data.assign(
+            station_name=info['name'].to_numpy(),
+            station_lat=info['latitude'].to_numpy(),
+            station_lon=info['longitude'].to_numpy(),
+            station_id=ids.to_numpy()  # Add station ID to data
+        )
     
-    if data_frames:
-        return pd.concat(data_frames)
     return pd.DataFrame()  # Return empty DataFrame if no data found
 
+def _fetch_one(lat, lon, previous_days=1, timezone='UTC'):
+    """
+    Retrieves hourly weather data from the nearest station to a single location.
+    
+    Returns:
+        DataFrame with the station's data, or None if nothing was found
+    """
+    stations = get_nearest_stations(lat, lon)
+    
+    if stations.empty:
+        return None
+    
+    station_ids = stations.index.tolist()
+
+    # Retrieve weather data
+    weather_data = get_hourly_weather(station_ids, stations, previous_days, timezone)
+    if weather_data.empty:
+        return None
+    return weather_data
+
 def main(locations, previous_days=1, timezone='UTC'):
     """
     Retrieves hourly weather data for one or more locations.
     
+    Locations are fetched concurrently since each lookup is I/O-bound.
+    
     Args:
         locations: List of (lat, lon) tuples
         previous_days: Number of days of historical data to retrieve
         timezone: Target timezone for the datetime index (default: 'UTC')
     """
-    all_data = []
-
-    for lat, lon in locations:
-        stations = get_nearest_stations(lat, lon)
-        
-        if stations.empty:
-            continue
-        
-        station_ids = stations.index.tolist()
+    if not locations:
+        return None
 
-        # Retrieve weather data
-        weather_data = get_hourly_weather(station_ids, stations, previous_days, timezone)
-        if not weather_data.empty:
-            all_data.append(weather_data)
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(locations))) as executor:
+        results = executor.map(
+            lambda location: _fetch_one(location[0], location[1], previous_days, timezone),
+            locations
+        )
+        all_data = [weather_data for weather_data in results if weather_data is not None]
 
     if all_data:
-        final_data = pd.concat(all_data)
+        final_data = pd.concat(all_data, sort=False)
         return final_data
     else:
         return None
@@ -1,316 +1,402 @@
-import requests
-import pandas as pd
-from typing import List
-import re
-
-def getData(lat, lon, sites, variables=['temperature_2m','cloud_cover'], models=['ecmwf_ifs025','ecmwf_aifs025','bom_access_global','gfs_global', 'cma_grapes_global','ukmo_global_deterministic_10km']):
-    """
-    Retrieves hourly forecast data from the Open-Meteo API for one or more sites.
-
-    Args:
-        lat (list of str): List of latitudes.
-        lon (list of str): List of longitudes.
-        sites (list of str): List of site names (used for multi-site concatenation).
-        variables (list, optional): Hourly variables to fetch. Defaults to ['temperature_2m','cloud_cover'].
-        models (list, optional): Models to include in the forecast.
-
-    Returns:
-        pd.DataFrame: A DataFrame containing the hourly data.
-    """
-    if len(sites) > 1:
-        lat_str = ','.join(lat)
-        lon_str = ','.join(lon)
-    else:
-        lat_str = lat[0]
-        lon_str = lon[0]
-    variables_str = ','.join(variables)
-    models_str = ','.join(models)
-
-    url = f"https://api.open-meteo.com/v1/forecast?latitude={lat_str}&longitude={lon_str}&hourly={variables_str}&models={models_str}&timezone=GMT"
-
-    response = requests.get(url)
-    data = None
-    if response.status_code == 200:
-        data = response.json()
-    else:
-        print(f"Error retrieving hourly data from Open Meteo API. Status Code: {response.status_code}")
-        # Return an empty DataFrame structure on failure
-        return pd.DataFrame()
-
-    def makeFrame(siteData):
-        mdata = pd.DataFrame(siteData['hourly'])
-        mdata.index = pd.to_datetime(mdata['time'])
-        mdata = mdata.drop('time', axis=1)
-        return mdata
-    
-    if len(sites) > 1:
-        dlist = []
-        # Note: Open-Meteo returns a list of data dictionaries when multiple lat/lon are queried
-        # The zip assumes the response data corresponds to the input sites/lat/lon order
-        for d, site in zip(data, sites):
-            df = makeFrame(d)
-            df['site'] = site
-            dlist.append(df)
-        return pd.concat(dlist)
-
-    return makeFrame(data)
-
-
-def getDailyData(lat, lon, sites, variables=['temperature_2m_max','temperature_2m_min'], models=['ecmwf_ifs','ecmwf_aifs025','bom_access_global','gfs_global', 'cma_grapes_global','ukmo_global_deterministic_10km']):
-    """
-    Retrieves daily forecast data from the Open-Meteo API for one or more sites.
-
-    Args:
-        lat (list of str): List of latitudes.
-        lon (list of str): List of longitudes.
-        sites (list of str): List of site names (used for multi-site concatenation).
-        variables (list, optional): Daily variables to fetch. Defaults to ['temperature_2m_max','temperature_2m_min'].
-        models (list, optional): Models to include in the forecast.
-
-    Returns:
-        pd.DataFrame: A DataFrame containing the daily data.
-    """
-    if len(sites) > 1:
-        lat_str = ','.join(lat)
-        lon_str = ','.join(lon)
-    else:
-        lat_str = lat[0]
-        lon_str = lon[0]
-    variables_str = ','.join(variables)
-    models_str = ','.join(models)
-
-    url = f"https://api.open-meteo.com/v1/forecast?latitude={lat_str}&longitude={lon_str}&daily={variables_str}&models={models_str}&timezone=GMT"
-
-    response = requests.get(url)
-    data = None
-    if response.status_code == 200:
-        data = response.json()
-    else:
-        print(f"Error retrieving daily data from Open Meteo API. Status Code: {response.status_code}")
-        # Return an empty DataFrame structure on failure
-        return pd.DataFrame()
-
-    def makeFrame(siteData):
-        mdata = pd.DataFrame(siteData['daily'])
-        mdata.index = pd.to_datetime(mdata['time'])
-        mdata = mdata.drop('time', axis=1)
-        return mdata
-    
-    if len(sites) > 1:
-        dlist = []
-        for d, site in zip(data, sites):
-            df = makeFrame(d)
-            df['site'] = site
-            dlist.append(df)
-        return pd.concat(dlist)
-
-    return makeFrame(data)
-
-
-import pandas as pd
-import requests
-from typing import List, Dict
-
-def getEnsembleData(lat_list: List[str], lon_list: List[str], site_list: List[str], 
-                    variables: List[str], models: List[str]) -> pd.DataFrame:
-    """
-    Fetch ensemble forecast data from Open-Meteo Ensemble API, handling the flat member-per-column structure.
-    
-    Args:
-        lat_list: List of latitude strings
-        lon_list: List of longitude strings  
-        site_list: List of site names
-        variables: List of variable names to fetch (e.g., ['temperature_2m'])
-        models: List of ensemble model names
-    
-    Returns:
-        DataFrame with datetime index and columns following 'variable_model_member_XX' convention.
-    """
-    
-    # Map model names to API parameters
-    model_mapping: Dict[str, str] = {
-        'ecmwf_ifs_ensemble': 'ecmwf_ifs025',
-        'gfs_ensemble': 'gfs025',
-    }
-    
-    all_site_model_data = []
-    
-    # We use the internal API model name for column construction
-    # We assume only one model is requested per API call, matching the structure of your original code
-    
-    for lat, lon, site in zip(lat_list, lon_list, site_list):
-        for model in models:
-            api_model = model_mapping.get(model, model)
-            
-            # Build API URL
-            base_url = "https://ensemble-api.open-meteo.com/v1/ensemble"
-            
-            params = {
-                'latitude': lat,
-                'longitude': lon,
-                'hourly': ','.join(variables),
-                'models': api_model,
-                'timezone': 'GMT'
-            }
-            
-            try:
-                response = requests.get(base_url, params=params, timeout=30)
-                response.raise_for_status()
-                data = response.json()
-                
-                if 'hourly' not in data:
-                    print(f"No hourly data found for {site} with {model}")
-                    continue
-                
-                # 1. Parse the datetime index
-                times = pd.to_datetime(data['hourly']['time'])
-                # Start a wide DataFrame for this site/model combination
-                df_temp = pd.DataFrame({'time': times, 'site': site})
-                
-                # 2. Iterate through ALL keys returned in 'hourly' to find members
-                for variable_key, var_values in data['hourly'].items():
-                    if variable_key == 'time':
-                        continue
-
-                    # Check if the variable key is one of the variables we requested (e.g., 'temperature_2m')
-                    base_variable = next((v for v in variables if variable_key.startswith(v)), None)
-                    
-                    if base_variable:
-                        # Case A: Control member (e.g., 'temperature_2m')
-                        if variable_key == base_variable:
-                            col_name = f"{base_variable}_{model}" # Deterministic column name
-                            df_temp[col_name] = var_values
-                            
-                        # Case B: Numbered member (e.g., 'temperature_2m_member01')
-                        elif variable_key.startswith(f"{base_variable}_member"):
-                            # Extract the member number (e.g., '01') and format it consistently
-                            match = re.search(r'member(\d+)', variable_key)
-                            if match:
-                                member_idx = int(match.group(1)) # Convert to int
-                                # Use f-string for consistent member naming like in the plotting function
-                                col_name = f"{base_variable}_{model}_member_{member_idx:02d}"
-                                df_temp[col_name] = var_values
-                            
-                # Append the resulting wide DataFrame for this site/model
-                all_site_model_data.append(df_temp)
-                
-            except requests.exceptions.RequestException as e:
-                print(f"Error fetching ensemble data for {site} with {model}: {e}")
-                continue
-            except Exception as e:
-                print(f"Error parsing ensemble data for {site} with {model}: {e}")
-                continue
-    
-    if not all_site_model_data:
-        return pd.DataFrame()
-    
-    # Use functools.reduce for robustly merging all wide DataFrames on 'time' and 'site'
-    from functools import reduce
-    result_df = reduce(lambda left, right: pd.merge(left, right, on=['time', 'site'], how='outer'), 
-                       all_site_model_data)
-
-    # Final formatting: Set time as index and drop the site column
-    result_df = result_df.set_index('time')
-    result_df = result_df.drop(columns=['site'])
-    return result_df
-
-def getDailyEnsembleData(lat_list: List[str], lon_list: List[str], site_list: List[str],
-                         variables: List[str], models: List[str]) -> pd.DataFrame:
-    """
-    Fetch daily ensemble forecast data from Open-Meteo Ensemble API
-    
-    Args:
-        lat_list: List of latitude strings
-        lon_list: List of longitude strings
-        site_list: List of site names
-        variables: List of daily variable names to fetch
-        models: List of ensemble model names
-    
-    Returns:
-        DataFrame with datetime index and columns for each variable_model_member combination
-    """
-    
-    # Map model names to API parameters
-    model_mapping = {
-        'ecmwf_ifs_ensemble': 'ecmwf_ifs025',
-        'gfs_ensemble': 'gfs025',
-        'bom_access_global_ensemble': 'bom_access_global_ensemble'
-    }
-    
-    all_data = []
-    
-    for lat, lon, site in zip(lat_list, lon_list, site_list):
-        for model in models:
-            api_model = model_mapping.get(model, model)
-            
-            # Build API URL
-            base_url = "https://ensemble-api.open-meteo.com/v1/ensemble"
-            
-            params = {
-                'latitude': lat,
-                'longitude': lon,
-                'daily': ','.join(variables),
-                'models': api_model,
-                'timezone': 'auto'
-            }
-            
-            try:
-                response = requests.get(base_url, params=params, timeout=30)
-                response.raise_for_status()
-                data = response.json()
-                
-                if 'daily' not in data:
-                    continue
-                
-                # Parse the datetime
-                times = pd.to_datetime(data['daily']['time'])
-                
-                # Extract data for each variable and ensemble member
-                for variable in variables:
-                    if variable in data['daily']:
-                        var_data = data['daily'][variable]
-                        
-                        # Check if it's ensemble data (list of lists) or single value (list)
-                        if isinstance(var_data[0], list):
-                            # Ensemble data - multiple members
-                            num_members = len(var_data[0])
-                            
-                            for member_idx in range(num_members):
-                                member_values = [timestep[member_idx] for timestep in var_data]
-                                col_name = f"{variable}_{model}_member_{member_idx:02d}"
-                                
-                                df_temp = pd.DataFrame({
-                                    'time': times,
-                                    col_name: member_values,
-                                    'site': site
-                                })
-                                all_data.append(df_temp)
-                        else:
-                            # Single deterministic value
-                            col_name = f"{variable}_{model}"
-                            df_temp = pd.DataFrame({
-                                'time': times,
-                                col_name: var_data,
-                                'site': site
-                            })
-                            all_data.append(df_temp)
-                            
-            except requests.exceptions.RequestException as e:
-                print(f"Error fetching daily ensemble data for {site} with {model}: {e}")
-                continue
-            except Exception as e:
-                print(f"Error parsing daily ensemble data for {site} with {model}: {e}")
-                continue
-    
-    if not all_data:
-        return pd.DataFrame()
-    
-    # Merge all dataframes
-    result_df = all_data[0]
-    for df in all_data[1:]:
-        result_df = pd.merge(result_df, df, on=['time', 'site'], how='outer')
-    
-    result_df = result_df.set_index('time')
-    result_df = result_df.drop(columns=['site'])
-    
+import requests
+import pandas as pd
+import numpy as np
+from typing import List, Dict, Optional, Tuple, Union
+import re
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson parses the large ensemble payloads several times faster than the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Ensemble member suffix in Open-Meteo keys (e.g. 'temperature_2m_member01')
+_MEMBER_RE = re.compile(r'member(\d+)')
+
+# Open-Meteo returns ISO-8601 timestamps; an explicit format skips per-element inference
+_HOURLY_TIME_FORMAT = '%Y-%m-%dT%H:%M'
+_DAILY_TIME_FORMAT = '%Y-%m-%d'
+
+# Shared session so repeated calls reuse pooled connections instead of a new TLS handshake each time.
+# The final response is returned once retries run out (raise_on_status=False), so the status
+# checks below still apply.
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504], raise_on_status=False)
+))
+
+
+def _parse_json(response: requests.Response):
+    """Parse a JSON response body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def getData(lat: Union[str, List[str]], lon: Union[str, List[str]], sites: Union[str, List[str]], variables=['temperature_2m','cloud_cover'], models=['ecmwf_ifs025','ecmwf_aifs025','bom_access_global','gfs_global', 'cma_grapes_global','ukmo_global_deterministic_10km']):
+    """
+    Retrieves hourly forecast data from the Open-Meteo API for one or more sites.
+
+    Args:
+        lat (str or list of str): Latitude, or list of latitudes.
+        lon (str or list of str): Longitude, or list of longitudes.
+        sites (str or list of str): Site name, or list of site names (used for multi-site concatenation).
+        variables (list, optional): Hourly variables to fetch. Defaults to ['temperature_2m','cloud_cover'].
+        models (list, optional): Models to include in the forecast.
+
+    Returns:
+        pd.DataFrame: A DataFrame containing the hourly data.
+    """
+    # A single site can be passed as plain strings, skipping the list handling
+    multi_site = not isinstance(lat, str) and len(sites) > 1
+    if multi_site:
+        lat_str = ','.join(lat)
+        lon_str = ','.join(lon)
+    elif isinstance(lat, str):
+        lat_str = lat
+        lon_str = lon
+    else:
+        lat_str = lat[0]
+        lon_str = lon[0]
+    variables_str = ','.join(variables)
+    models_str = ','.join(models)
+
+    url = f"https://api.open-meteo.com/v1/forecast?latitude={lat_str}&longitude={lon_str}&hourly={variables_str}&models={models_str}&timezone=GMT"
+
+    response = _SESSION.get(url, timeout=30)
+    data = None
+    if response.status_code == 200:
+        data = _parse_json(response)
+    else:
+        print(f"Error retrieving hourly data from Open Meteo API. Status Code: {response.status_code}")
+        # Return an empty DataFrame structure on failure
+        return pd.DataFrame()
+
+    def makeFrame(siteData):
+        # Build the frame directly on the time index rather than adding then dropping a 'time' column
+        hourly = siteData['hourly']
+        index = pd.to_datetime(hourly['time'], format=_HOURLY_TIME_FORMAT)
+        index.name = 'time'
+        return pd.DataFrame({key: values for key, values in hourly.items() if key != 'time'}, index=index)
+    
+    if multi_site:
+        dlist = []
+        # Note: Open-Meteo returns a list of data dictionaries when multiple lat/lon are queried
+        # The zip assumes the response data corresponds to the input sites/lat/lon order
+        for d, site in zip(data, sites):
+            df = makeFrame(d)
+            df['site'] = site
+            dlist.append(df)
+        return pd.concat(dlist)
+
+    return makeFrame(data)
+
+
+def getDailyData(lat: Union[str, List[str]], lon: Union[str, List[str]], sites: Union[str, List[str]], variables=['temperature_2m_max','temperature_2m_min'], models=['ecmwf_ifs','ecmwf_aifs025','bom_access_global','gfs_global', 'cma_grapes_global','ukmo_global_deterministic_10km']):
+    """
+    Retrieves daily forecast data from the Open-Meteo API for one or more sites.
+
+    Args:
+        lat (str or list of str): Latitude, or list of latitudes.
+        lon (str or list of str): Longitude, or list of longitudes.
+        sites (str or list of str): Site name, or list of site names (used for multi-site concatenation).
+        variables (list, optional): Daily variables to fetch. Defaults to ['temperature_2m_max','temperature_2m_min'].
+        models (list, optional): Models to include in the forecast.
+
+    Returns:
+        pd.DataFrame: A DataFrame containing the daily data.
+    """
+    # A single site can be passed as plain strings, skipping the list handling
+    multi_site = not isinstance(lat, str) and len(sites) > 1
+    if multi_site:
+        lat_str = ','.join(lat)
+        lon_str = ','.join(lon)
+    elif isinstance(lat, str):
+        lat_str = lat
+        lon_str = lon
+    else:
+        lat_str = lat[0]
+        lon_str = lon[0]
+    variables_str = ','.join(variables)
+    models_str = ','.join(models)
+
+    url = f"https://api.open-meteo.com/v1/forecast?latitude={lat_str}&longitude={lon_str}&daily={variables_str}&models={models_str}&timezone=GMT"
+
+    response = _SESSION.get(url, timeout=30)
+    data = None
+    if response.status_code == 200:
+        data = _parse_json(response)
+    else:
+        print(f"Error retrieving daily data from Open Meteo API. Status Code: {response.status_code}")
+        # Return an empty DataFrame structure on failure
+        return pd.DataFrame()
+
+    def makeFrame(siteData):
+        # Build the frame directly on the time index rather than adding then dropping a 'time' column
+        daily = siteData['daily']
+        index = pd.to_datetime(daily['time'], format=_DAILY_TIME_FORMAT)
+        index.name = 'time'
+        return pd.DataFrame({key: values for key, values in daily.items() if key != 'time'}, index=index)
+    
+    if multi_site:
+        dlist = []
+        for d, site in zip(data, sites):
+            df = makeFrame(d)
+            df['site'] = site
+            dlist.append(df)
+        return pd.concat(dlist)
+
+    return makeFrame(data)
+
+
+ENSEMBLE_API_URL = "https://ensemble-api.open-meteo.com/v1/ensemble"
+
+# Cap on concurrent requests to the ensemble API
+MAX_CONCURRENT_REQUESTS = 16
+
+
+def _fetch_ensemble_json(model: str, params: Dict, label: str) -> Optional[Dict]:
+    """
+    Fetch a single ensemble API response.
+
+    Args:
+        model: Model name (for error messages)
+        params: Query parameters for the ensemble API
+        label: Description of the request (for error messages)
+
+    Returns:
+        Parsed JSON response, or None if the request failed.
+    """
+    try:
+        response = _SESSION.get(ENSEMBLE_API_URL, params=params, timeout=30)
+        response.raise_for_status()
+        return _parse_json(response)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Error fetching {label} with {model}: {e}")
+        return None
+
+
+def _fetch_ensemble_all(jobs: List[Tuple[str, Dict]], label: str) -> List[Tuple[str, Optional[Dict]]]:
+    """
+    Fetch all (model, params) jobs concurrently.
+
+    The requests are independent and I/O-bound, so they are issued from a thread
+    pool and total latency is bounded by the slowest response rather than the sum.
+
+    Returns:
+        List of (model, data) in the same order as jobs.
+    """
+    if not jobs:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(jobs))) as executor:
+        responses = list(executor.map(lambda job: _fetch_ensemble_json(*job, label), jobs))
+
+    return [(model, data) for (model, _), data in zip(jobs, responses)]
+
+
+def _split_sites(data, sites: List[str]) -> List[Tuple[str, Dict]]:
+    """
+    Pair each site with its part of a (possibly multi-site) API response.
+
+    Open-Meteo returns a list of per-location dictionaries when several
+    comma-separated coordinates are queried, and a single dictionary otherwise.
+    """
+    site_data = data if isinstance(data, list) else [data]
+    return list(zip(sites, site_data))
+
+def getEnsembleData(lat_list: List[str], lon_list: List[str], site_list: List[str], 
+                    variables: List[str], models: List[str]) -> pd.DataFrame:
+    """
+    Fetch ensemble forecast data from Open-Meteo Ensemble API, handling the flat member-per-column structure.
+    
+    Args:
+        lat_list: List of latitude strings
+        lon_list: List of longitude strings  
+        site_list: List of site names
+        variables: List of variable names to fetch (e.g., ['temperature_2m'])
+        models: List of ensemble model names
+    
+    Returns:
+        DataFrame with datetime index and columns following 'variable_model_member_XX' convention.
+    """
+    
+    # Map model names to API parameters
+    model_mapping: Dict[str, str] = {
+        'ecmwf_ifs_ensemble': 'ecmwf_ifs025',
+        'gfs_ensemble': 'gfs025',
+    }
+    
+    all_site_model_data: Dict[str, List[pd.DataFrame]] = {}  # model -> per-site frames
+    
+    # We use the internal API model name for column construction
+    # We assume only one model is requested per API call, matching the structure of your original code
+    
+    # One request per model covering every site (comma-separated coordinates),
+    # with the per-model requests fetched concurrently
+    jobs = []
+    for model in models:
+        params = {
+            'latitude': ','.join(lat_list),
+            'longitude': ','.join(lon_list),
+            'hourly': ','.join(variables),
+            'models': model_mapping.get(model, model),
+            'timezone': 'GMT'
+        }
+        jobs.append((model, params))
+    
+    for model, data in _fetch_ensemble_all(jobs, 'ensemble data'):
+        if data is None:
+            continue
+        
+        for site, site_data in _split_sites(data, site_list):
+            try:
+                if 'hourly' not in site_data:
+                    print(f"No hourly data found for {site} with {model}")
+                    continue
+            
+                # 1. Parse the datetime index
+                times = pd.to_datetime(site_data['hourly']['time'], format=_HOURLY_TIME_FORMAT)
+                # Collect the columns for this site/model combination and build the wide DataFrame once
+                columns = {'time': times, 'site': site}
+            
+                # 2. Iterate through ALL keys returned in 'hourly' to find members
+                for variable_key, var_values in site_data['hourly'].items():
+                    if variable_key == 'time':
+                        continue
+
+                    # Check if the variable key is one of the variables we requested (e.g., 'temperature_2m')
+                    base_variable = next((v for v in variables if variable_key.startswith(v)), None)
+                
+                    if base_variable:
+                        # Case A: Control member (e.g., 'temperature_2m')
+                        if variable_key == base_variable:
+                            col_name = f"{base_variable}_{model}" # Deterministic column name
+                            columns[col_name] = var_values
+                        
+                        # Case B: Numbered member (e.g., 'temperature_2m_member01')
+                        elif variable_key.startswith(f"{base_variable}_member"):
+                            # Extract the member number (e.g., '01') and format it consistently
+                            match = _MEMBER_RE.search(variable_key)
+                            if match:
+                                member_idx = int(match.group(1)) # Convert to int
+                                # Use f-string for consistent member naming like in the plotting function
+                                col_name = f"{base_variable}_{model}_member_{member_idx:02d}"
+                                columns[col_name] = var_values
+                        
+                # Append the resulting wide DataFrame for this site/model
+                all_site_model_data.setdefault(model, []).append(
+                    pd.DataFrame(columns).set_index(['time', 'site'])
+                )
+            
+            except Exception as e:
+                print(f"Error parsing ensemble data for {site} with {model}: {e}")
+                continue
+
+    if not all_site_model_data:
+        return pd.DataFrame()
+    
+    # Stack each model's sites, then outer-join the models side by side on (time, site)
+    model_frames = [pd.concat(frames) for frames in all_site_model_data.values()]
+    result_df = pd.concat(model_frames, axis=1)
+
+    # Final formatting: Keep time as the index and drop the site level
+    result_df = result_df.reset_index(level='site', drop=True)
+    return result_df
+
+def getDailyEnsembleData(lat_list: List[str], lon_list: List[str], site_list: List[str],
+                         variables: List[str], models: List[str]) -> pd.DataFrame:
+    """
+    Fetch daily ensemble forecast data from Open-Meteo Ensemble API
+    
+    Args:
+        lat_list: List of latitude strings
+        lon_list: List of longitude strings
+        site_list: List of site names
+        variables: List of daily variable names to fetch
+        models: List of ensemble model names
+    
+    Returns:
+        DataFrame with datetime index and columns for each variable_model_member combination
+    """
+    
+    # Map model names to API parameters
+    model_mapping = {
+        'ecmwf_ifs_ensemble': 'ecmwf_ifs025',
+        'gfs_ensemble': 'gfs025',
+        'bom_access_global_ensemble': 'bom_access_global_ensemble'
+    }
+    
+    all_site_model_data: Dict[str, List[pd.DataFrame]] = {}  # model -> per-site frames
+    
+    # One request per model covering every site (comma-separated coordinates),
+    # with the per-model requests fetched concurrently
+    jobs = []
+    for model in models:
+        params = {
+            'latitude': ','.join(lat_list),
+            'longitude': ','.join(lon_list),
+            'daily': ','.join(variables),
+            'models': model_mapping.get(model, model),
+            'timezone': 'auto'
+        }
+        jobs.append((model, params))
+    
+    for model, data in _fetch_ensemble_all(jobs, 'daily ensemble data'):
+        if data is None:
+            continue
+        
+        for site, site_data in _split_sites(data, site_list):
+            try:
+                if 'daily' not in site_data:
+                    continue
+            
+                # Parse the datetime
+                times = pd.to_datetime(site_data['daily']['time'], format=_DAILY_TIME_FORMAT)
+                # Collect the columns for this site/model combination and build the wide DataFrame once
+                columns = {'time': times, 'site': site}
+            
+                # Extract data for each variable and ensemble member
+                for variable in variables:
+                    if variable in site_data['daily']:
+                        var_data = site_data['daily'][variable]
+                    
+                        # Check if it's ensemble data (list of lists) or single value (list)
+                        if isinstance(var_data[0], list):
+                            # Ensemble data - multiple members; convert once to a (time, member) array
+                            # so each member is a column slice rather than a per-timestep Python loop
+                            member_array = np.asarray(var_data, dtype=float)
+                        
+                            for member_idx in range(member_array.shape[1]):
+                                col_name = f"{variable}_{model}_member_{member_idx:02d}"
+                                columns[col_name] = member_array[:, member_idx]
+                        else:
+                            # Single deterministic value
+                            col_name = f"{variable}_{model}"
+                            columns[col_name] = var_data
+                
+                # Append the resulting wide DataFrame for this site/model
+                all_site_model_data.setdefault(model, []).append(
+                    pd.DataFrame(columns).set_index(['time', 'site'])
+                )
+            
+            except Exception as e:
+                print(f"Error parsing daily ensemble data for {site} with {model}: {e}")
+                continue
+
+    if not all_site_model_data:
+        return pd.DataFrame()
+    
+    # Stack each model's sites, then outer-join the models side by side on (time, site)
+    model_frames = [pd.concat(frames) for frames in all_site_model_data.values()]
+    result_df = pd.concat(model_frames, axis=1)
+    
+    # Keep time as the index and drop the site level
+    result_df = result_df.reset_index(level='site', drop=True)
+    
     return result_df
\ No newline at end of file
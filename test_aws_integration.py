@@ -9,54 +9,42 @@ Usage: python test_aws_integration.py
 
 import sys
 import os
+import importlib.util
+import getpass
+import traceback
+import types
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Project modules are imported once here; test_imports reports whether this succeeded
+try:
+    from utils.cognito_auth import CognitoAuth
+    from aws_api_extract import AWSAPIClient
+    from data_sources.aws_api import AWSAPIDataSource
+    _HAS_AWS = True
+    _AWS_IMPORT_ERROR = None
+except ImportError as e:
+    _HAS_AWS = False
+    _AWS_IMPORT_ERROR = e
+
 def test_imports():
     """Test that all required modules can be imported"""
     print("Testing imports...")
-    try:
-        import boto3
-        print("  ✓ boto3")
-    except ImportError:
-        print("  ✗ boto3 - Run: pip install boto3")
-        return False
-    
-    try:
-        import xarray
-        print("  ✓ xarray")
-    except ImportError:
-        print("  ✗ xarray - Run: pip install xarray")
-        return False
-    
-    try:
-        import netCDF4
-        print("  ✓ netCDF4")
-    except ImportError:
-        print("  ✗ netCDF4 - Run: pip install netCDF4")
-        return False
-    
-    try:
-        from utils.cognito_auth import CognitoAuth
-        print("  ✓ cognito_auth")
-    except ImportError as e:
-        print(f"  ✗ cognito_auth - {e}")
-        return False
-    
-    try:
-        from aws_api_extract import AWSAPIClient
-        print("  ✓ aws_api_extract")
-    except ImportError as e:
-        print(f"  ✗ aws_api_extract - {e}")
-        return False
+    # Third-party packages only need to be installed, so probe for them without importing
+    for module in ('boto3', 'xarray', 'netCDF4'):
+        if importlib.util.find_spec(module) is None:
+            print(f"  ✗ {module} - Run: pip install {module}")
+            return False
+        print(f"  ✓ {module}")
     
-    try:
-        from data_sources.aws_api import AWSAPIDataSource
-        print("  ✓ aws_api data source")
-    except ImportError as e:
-        print(f"  ✗ aws_api data source - {e}")
+    # The project modules were imported for real at load time, so errors in them are caught
+    if not _HAS_AWS:
+        print(f"  ✗ project modules - {_AWS_IMPORT_ERROR}")
         return False
+    print("  ✓ cognito_auth")
+    print("  ✓ aws_api_extract")
+    print("  ✓ aws_api data source")
     
     print("All imports successful!\n")
     return True
@@ -76,7 +64,6 @@ def test_authentication():
         print("  ✗ User Pool ID and Client ID are required")
         return None, None
     
-    import getpass
     password = getpass.getpass("Password: ")
     
     if not username or not password:
@@ -84,7 +71,6 @@ def test_authentication():
         return None, None
     
     try:
-        from utils.cognito_auth import CognitoAuth
         auth = CognitoAuth(user_pool_id, client_id)
         
         print("  Authenticating...")
@@ -107,8 +93,6 @@ def test_api_client(id_token):
     print("\nTesting API client...")
     
     try:
-        from aws_api_extract import AWSAPIClient
-        
         base_url = "https://fmeq0xvw60.execute-api.ap-southeast-2.amazonaws.com/prod"
         client = AWSAPIClient(base_url, id_token)
         
@@ -138,7 +122,6 @@ def test_api_client(id_token):
         return True
     except Exception as e:
         print(f"  ✗ API client test failed: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
@@ -148,8 +131,6 @@ def test_data_source(id_token):
     print("\nTesting DataSource implementation...")
     
     try:
-        from data_sources.aws_api import AWSAPIDataSource
-        
         base_url = "https://fmeq0xvw60.execute-api.ap-southeast-2.amazonaws.com/prod"
         ds = AWSAPIDataSource(base_url, id_token, domain="brisbane")
         
@@ -171,7 +152,6 @@ def test_data_source(id_token):
         # Test getting deterministic data
         print("  Testing deterministic data retrieval (GSO, Brisbane)...")
         # Create a mock streamlit module to avoid import errors
-        import types
         mock_st = types.ModuleType('streamlit')
         mock_st.warning = lambda x: print(f"    Warning: {x}")
         mock_st.session_state = {}
@@ -197,7 +177,6 @@ def test_data_source(id_token):
         return True
     except Exception as e:
         print(f"  ✗ DataSource test failed: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
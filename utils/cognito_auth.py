@@ -2,8 +2,57 @@
 # -*- coding: utf-8 -*-
 """AWS Cognito authentication for AWS API data source"""
 
+import base64
+import hashlib
+import hmac
+import json
+import os
+import tempfile
+import threading
+import time
 import boto3
-from typing import Optional, Tuple
+from botocore.config import Config
+from functools import lru_cache, partial
+from typing import Dict, Optional, Tuple
+
+# Keep connections alive between calls so repeated authentications skip TCP/TLS setup
+_CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=10,
+    retries={'mode': 'adaptive', 'max_attempts': 3}
+)
+
+
+# One botocore session for the process, so the credential/config resolution runs once
+_SESSION = boto3.session.Session()
+_SESSION_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _get_client(region: str):
+    """Return a shared cognito-idp client for the region (boto3 clients are thread-safe)"""
+    # Creating clients from a shared session is not thread-safe, so serialize it
+    with _SESSION_LOCK:
+        return _SESSION.client('cognito-idp', region_name=region, config=_CLIENT_CONFIG)
+
+
+# On-disk token cache so script launches and app restarts skip the initiate_auth round-trip
+TOKEN_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'wxapp')
+
+# Treat tokens as expired this many seconds early
+TOKEN_EXPIRY_MARGIN = 30
+
+
+def _token_expiry(token: str) -> float:
+    """Read the exp claim from a JWT (no signature check; only used to decide when to refresh)"""
+    payload = token.split('.')[1]
+    payload += '=' * (-len(payload) % 4)
+    return float(json.loads(base64.urlsafe_b64decode(payload))['exp'])
+
+
+def _password_digest(password: str, salt: bytes) -> str:
+    """Salted hash of the password, so a cached token is only returned for the right password"""
+    return hashlib.pbkdf2_hmac('sha256', password.encode(), salt, 100_000).hex()
 
 
 class CognitoAuth:
@@ -26,7 +75,14 @@ class CognitoAuth:
         self.user_pool_id = user_pool_id
         self.client_id = client_id
         self.region = region
-        self.client = boto3.client('cognito-idp', region_name=region)
+        self.client = _get_client(region)
+        
+        # Bind the fixed sign-in arguments once; only the credentials vary per call
+        self._password_auth = partial(
+            self.client.initiate_auth,
+            ClientId=client_id,
+            AuthFlow='USER_PASSWORD_AUTH'
+        )
     
     def authenticate(self, username: str, password: str) -> Tuple[bool, Optional[str], Optional[str]]:
         """
@@ -39,10 +95,18 @@ class CognitoAuth:
         Returns:
             Tuple of (success, id_token, error_message)
         """
+        # Reuse a cached token (refreshing it if it has expired) before a full sign-in
+        cached = self._load_cached_tokens(username, password)
+        if cached is not None:
+            if cached['exp'] - time.time() > TOKEN_EXPIRY_MARGIN:
+                return True, cached['id_token'], None
+            
+            id_token = self._refresh(username, cached)
+            if id_token is not None:
+                return True, id_token, None
+        
         try:
-            response = self.client.initiate_auth(
-                ClientId=self.client_id,
-                AuthFlow='USER_PASSWORD_AUTH',
+            response = self._password_auth(
                 AuthParameters={
                     'USERNAME': username,
                     'PASSWORD': password
@@ -50,7 +114,9 @@ class CognitoAuth:
             )
             
             # Extract ID token
-            id_token = response['AuthenticationResult']['IdToken']
+            result = response['AuthenticationResult']
+            id_token = result['IdToken']
+            self._store_cached_tokens(username, password, id_token, result.get('RefreshToken'))
             return True, id_token, None
             
         except self.client.exceptions.NotAuthorizedException:
@@ -60,6 +126,105 @@ class CognitoAuth:
         except Exception as e:
             return False, None, f"Authentication error: {str(e)}"
     
+    def _refresh(self, username: str, cached: Dict) -> Optional[str]:
+        """
+        Exchange a cached refresh token for a new ID token
+        
+        Args:
+            username: Username the tokens belong to
+            cached: Cache entry from _load_cached_tokens
+        
+        Returns:
+            New ID token, or None if there is no refresh token or the refresh failed
+        """
+        if not cached.get('refresh_token'):
+            return None
+        
+        try:
+            response = self.client.initiate_auth(
+                ClientId=self.client_id,
+                AuthFlow='REFRESH_TOKEN_AUTH',
+                AuthParameters={'REFRESH_TOKEN': cached['refresh_token']}
+            )
+            id_token = response['AuthenticationResult']['IdToken']
+            exp = _token_expiry(id_token)
+        except Exception:
+            # Includes a refreshed token that isn't a readable JWT; sign in with the password
+            return None
+        
+        # Cognito doesn't rotate the refresh token on this flow, so keep the cached one
+        cached.update(id_token=id_token, exp=exp)
+        self._write_cache(username, cached)
+        return id_token
+    
+    def _cache_path(self, username: str) -> str:
+        """Path of the token cache file for this pool, client and user"""
+        key = hashlib.sha256(f"{self.user_pool_id}:{self.client_id}:{username}".encode()).hexdigest()
+        return os.path.join(TOKEN_CACHE_DIR, f"cognito_{key}.json")
+    
+    def _load_cached_tokens(self, username: str, password: str) -> Optional[Dict]:
+        """
+        Load cached tokens for the user, if present and the password matches
+        
+        Args:
+            username: Username
+            password: Password, checked against the cached digest
+        
+        Returns:
+            Cache entry dict, or None on a miss
+        """
+        try:
+            with open(self._cache_path(username)) as f:
+                cached = json.load(f)
+            digest = _password_digest(password, bytes.fromhex(cached['salt']))
+            if not hmac.compare_digest(digest, cached['password_digest']):
+                return None
+            return cached
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def _store_cached_tokens(self, username: str, password: str, id_token: str, refresh_token: Optional[str]):
+        """
+        Cache tokens from a successful sign-in
+        
+        Args:
+            username: Username
+            password: Password (only a salted digest is stored)
+            id_token: ID token
+            refresh_token: Refresh token, if one was issued
+        """
+        try:
+            salt = os.urandom(16)
+            self._write_cache(username, {
+                'id_token': id_token,
+                'refresh_token': refresh_token,
+                'exp': _token_expiry(id_token),
+                'salt': salt.hex(),
+                'password_digest': _password_digest(password, salt)
+            })
+        except (ValueError, KeyError, IndexError):
+            # Token isn't a readable JWT; just don't cache it
+            pass
+    
+    def _write_cache(self, username: str, entry: Dict):
+        """Atomically write a cache entry, readable only by the current user"""
+        path = self._cache_path(username)
+        tmp_path = None
+        try:
+            os.makedirs(TOKEN_CACHE_DIR, mode=0o700, exist_ok=True)
+            # Unique temp file (created 0600), so concurrent refreshes never share one
+            fd, tmp_path = tempfile.mkstemp(dir=TOKEN_CACHE_DIR, prefix=os.path.basename(path), suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            # The cache is best-effort; authentication still succeeded
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+    
     @staticmethod
     def validate_token(id_token: str) -> bool:
         """
@@ -10,29 +10,104 @@ to canonical variable names.
 
 import sys
 import os
-from typing import Dict, List, Set, Tuple
-from collections import defaultdict
+import time
+import argparse
+import getpass
+from typing import Dict, List, Optional, Set, Tuple
+from itertools import groupby
+from concurrent.futures import ThreadPoolExecutor
 import json
+import re
+import numpy as np
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from aws_api_extract import AWSAPIClient, MODELS, CE_DOMAINS
-from utils.variable_mapper import VariableMapper
+from utils.variable_mapper import VariableMapper, get_mapper
+from utils.cognito_auth import CognitoAuth
+
+# Cap on concurrent metadata requests during discovery
+MAX_WORKERS = 16
+
+# On-disk cache of each model/domain's variable list; catalogues change rarely
+VARIABLE_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'wxapp', 'vars')
+VARIABLE_CACHE_TTL = 24 * 60 * 60  # seconds
+
+# Common AWS API naming patterns (aliases -> suggested canonical name)
+SUGGESTION_PATTERNS = {
+    # Temperature
+    ('t2m', 't_2m', 'temp_2m', 'air_temp_2m'): 'temperature_2m',
+    ('tmax', 't2m_max', 'temp_max'): 'temperature_2m_max',
+    ('tmin', 't2m_min', 'temp_min'): 'temperature_2m_min',
+    ('td', 'td2m', 'dew_point', 'dew_2m'): 'dewpoint_2m',
+    
+    # Wind
+    ('u10', 'v10', 'ws_10m', 'wspd_10m'): 'wind_speed_10m',
+    ('wdir_10m', 'wd_10m'): 'wind_direction_10m',
+    ('gust', 'gust_10m', 'wg_10m'): 'wind_gusts_10m',
+    
+    # Precipitation
+    ('precip', 'rain', 'rainfall', 'tp'): 'precipitation',
+    
+    # Humidity
+    ('rh', 'rh_2m', 'rel_hum'): 'relative_humidity_2m',
+    
+    # Pressure
+    ('mslp', 'pmsl', 'slp'): 'pressure_msl',
+    ('ps', 'sfc_pres'): 'surface_pressure',
+    
+    # Clouds
+    ('tcc', 'cld', 'cloudcover'): 'cloud_cover',
+    
+    # Radiation - IMPORTANT AWS-SPECIFIC MAPPINGS
+    ('sw_dn_avg', 'sw_dn', 'ghi_avg', 'swdown'): 'shortwave_radiation',
+    ('dni_avg', 'dni', 'sw_dir'): 'direct_radiation',
+    ('dhi_avg', 'dhi', 'sw_diff'): 'diffuse_radiation',
+    ('lw_dn', 'lw_down', 'lwdown'): 'longwave_radiation',
+    
+    # Solar-specific (GSO model)
+    ('ghi', 'global_horizontal_irradiance'): 'shortwave_radiation',
+    ('gti', 'global_tilted_irradiance'): 'tilted_radiation',
+    ('poa', 'plane_of_array'): 'poa_radiation',
+}
+
+# The same aliases flattened in priority order for the substring pass, plus an exact-match
+# lookup (first group wins) so exact names resolve without scanning every pattern
+_SUBSTRING_PATTERNS = [
+    (alias, canonical) for aliases, canonical in SUGGESTION_PATTERNS.items() for alias in aliases
+]
+_ALIAS_TO_CANONICAL = {alias: canonical for alias, canonical in reversed(_SUBSTRING_PATTERNS)}
+
+# Fallback heuristics as one regex. Every branch is a lookahead anchored at the start,
+# so branches are tried in priority order and the first one that matches wins.
+_HEURISTIC_RE = re.compile(
+    r'(?P<temperature_2m>(?=.*2m)(?:(?=.*temp)|(?=t)))'
+    r'|(?P<wind_speed_10m>(?=.*10m)(?=.*wind))'
+    r'|(?P<precipitation>(?=.*(?:precip|rain)))'
+    r'|(?P<relative_humidity_2m>(?=.*(?:humid|rh)))'
+    r'|(?P<surface_pressure>(?=.*pres))'
+    r'|(?P<cloud_cover>(?=.*cloud))'
+    r'|(?P<shortwave_radiation>(?=.*(?:sw|solar|irrad|ghi|rad)))',
+    re.DOTALL
+)
 
 
 class AWSVariableDiscovery:
     """Discover and analyze variables from AWS API"""
     
-    def __init__(self, client: AWSAPIClient):
+    def __init__(self, client: AWSAPIClient, use_cache: bool = True, mapper: Optional[VariableMapper] = None):
         """
         Initialize discovery tool
         
         Args:
             client: Authenticated AWSAPIClient instance
+            use_cache: Reuse variable lists cached on disk within VARIABLE_CACHE_TTL
+            mapper: VariableMapper to use (defaults to the shared global instance)
         """
         self.client = client
-        self.mapper = VariableMapper()
+        self.use_cache = use_cache
+        self.mapper = mapper if mapper is not None else get_mapper()
         
         # Storage for discovered variables
         self.model_variables: Dict[str, List[str]] = {}  # model -> variables
@@ -62,77 +137,58 @@ class AWSVariableDiscovery:
             print("AWS API Variable Discovery")
             print("=" * 60)
         
-        # Discover variables for each model
+        # Expand each model into the (model, domain) pairs it needs to be queried for
+        tasks = []
         for model in MODELS:
-            if verbose:
-                print(f"\n📦 Model: {model.upper()}")
-            
-            model_results = {
-                'has_domains': model in ['access-ce', 'gso'],
-                'variables': set(),
-                'domains': {}
-            }
-            
-            try:
-                if model == 'access-ce':
-                    # ACCESS-CE has different variables per domain
-                    for domain in CE_DOMAINS:
-                        if verbose:
-                            print(f"   🌏 Domain: {domain}", end=" ... ")
-                        
-                        try:
-                            vars_list = self.client.get_available_variables(model, domain)
-                            model_results['domains'][domain] = vars_list
-                            model_results['variables'].update(vars_list)
-                            results['all_unique_variables'].update(vars_list)
-                            
-                            if verbose:
-                                print(f"✓ {len(vars_list)} variables")
-                        
-                        except Exception as e:
-                            if verbose:
-                                print(f"✗ Error: {str(e)[:50]}")
-                
-                elif model == 'gso':
-                    # GSO uses australia domain
-                    if verbose:
-                        print(f"   🌏 Domain: australia", end=" ... ")
-                    
-                    try:
-                        vars_list = self.client.get_available_variables(model, 'australia')
-                        model_results['domains']['australia'] = vars_list
-                        model_results['variables'].update(vars_list)
-                        results['all_unique_variables'].update(vars_list)
-                        
-                        if verbose:
-                            print(f"✓ {len(vars_list)} variables")
-                    
-                    except Exception as e:
-                        if verbose:
-                            print(f"✗ Error: {str(e)[:50]}")
+            if model == 'access-ce':
+                # ACCESS-CE has different variables per domain
+                tasks.extend((model, domain) for domain in CE_DOMAINS)
+            elif model == 'gso':
+                # GSO uses australia domain
+                tasks.append((model, 'australia'))
+            else:
+                # access-g, access-ge don't use domains
+                tasks.append((model, None))
+        
+        # Metadata requests are network-bound, so issue them concurrently;
+        # map() keeps results in task order so the progress output stays grouped by model
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(tasks))) as executor:
+            fetched = list(executor.map(lambda task: self._fetch_variables(*task), tasks))
+        
+        for (model, domain), (vars_list, error) in zip(tasks, fetched):
+            if model not in results['models']:
+                if verbose:
+                    print(f"\n📦 Model: {model.upper()}")
                 
+                results['models'][model] = {
+                    'has_domains': model in ['access-ce', 'gso'],
+                    'variables': set(),
+                    'domains': {}
+                }
+            model_results = results['models'][model]
+            
+            if verbose:
+                if domain is not None:
+                    print(f"   🌏 Domain: {domain}", end=" ... ")
                 else:
-                    # access-g, access-ge don't use domains
-                    if verbose:
-                        print(f"   ", end="")
-                    
-                    try:
-                        vars_list = self.client.get_available_variables(model, None)
-                        model_results['variables'] = set(vars_list)
-                        results['all_unique_variables'].update(vars_list)
-                        
-                        if verbose:
-                            print(f"✓ {len(vars_list)} variables")
-                    
-                    except Exception as e:
-                        if verbose:
-                            print(f"✗ Error: {str(e)[:50]}")
-                
-                results['models'][model] = model_results
+                    print(f"   ", end="")
             
-            except Exception as e:
+            if error is not None:
                 if verbose:
-                    print(f"   ✗ Failed to query {model}: {str(e)[:100]}")
+                    print(f"✗ Error: {str(error)[:50]}")
+                continue
+            
+            # Intern names on ingress; the same names recur across models and domains and are
+            # looked up repeatedly in the mapping pass
+            vars_list = [sys.intern(var) for var in vars_list]
+            
+            if domain is not None:
+                model_results['domains'][domain] = vars_list
+            model_results['variables'].update(vars_list)
+            results['all_unique_variables'].update(vars_list)
+            
+            if verbose:
+                print(f"✓ {len(vars_list)} variables")
         
         # Analyze mappings
         if verbose:
@@ -141,13 +197,13 @@ class AWSVariableDiscovery:
             print(f"=" * 60)
             print(f"Total unique variables found: {len(results['all_unique_variables'])}")
         
-        # Check which variables are already mapped
-        for var in results['all_unique_variables']:
-            canonical = self.mapper.to_canonical(var)
-            if canonical == var:
-                # Not mapped (or is itself canonical)
-                if var not in self.mapper.canonical_to_alternatives:
-                    results['unmapped_variables'].add(var)
+        # Check which variables are already mapped: drop every known name with one set
+        # difference, then apply the mapper's case-insensitive lookup to what remains
+        known = self.mapper.alternative_to_canonical.keys() | self.mapper.canonical_to_alternatives.keys()
+        results['unmapped_variables'] = {
+            var for var in results['all_unique_variables'] - known
+            if var.lower() not in self.mapper.alternative_to_canonical
+        }
         
         if verbose:
             print(f"Already mapped variables: {len(results['all_unique_variables']) - len(results['unmapped_variables'])}")
@@ -158,6 +214,58 @@ class AWSVariableDiscovery:
         
         return results
     
+    def _fetch_variables(self, model: str, domain: Optional[str]) -> Tuple[Optional[List[str]], Optional[Exception]]:
+        """
+        Fetch the variables for one model/domain, capturing any error
+        
+        Args:
+            model: Model name
+            domain: Domain name, or None for models without domains
+        
+        Returns:
+            Tuple of (variables or None, exception or None)
+        """
+        try:
+            return self._cached_get_vars(model, domain), None
+        except Exception as e:
+            return None, e
+    
+    def _cached_get_vars(self, model: str, domain: Optional[str]) -> List[str]:
+        """
+        Get the variables for one model/domain, from the disk cache when it is fresh
+        
+        Args:
+            model: Model name
+            domain: Domain name, or None for models without domains
+        
+        Returns:
+            List of variable names
+        """
+        path = os.path.join(VARIABLE_CACHE_DIR, f"{model}_{domain or 'default'}.json")
+        
+        if self.use_cache:
+            try:
+                if time.time() - os.stat(path).st_mtime < VARIABLE_CACHE_TTL:
+                    with open(path) as f:
+                        return json.load(f)
+            except (OSError, ValueError):
+                pass
+        
+        vars_list = self.client.get_available_variables(model, domain)
+        
+        # Write to a temporary file and swap it in so concurrent fetches never see a partial file
+        try:
+            os.makedirs(VARIABLE_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(vars_list, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            # The cache is best-effort
+            pass
+        
+        return vars_list
+    
     def _suggest_mappings(self, unmapped_vars: Set[str]) -> Dict[str, str]:
         """
         Suggest canonical mappings for unmapped variables based on naming patterns
@@ -168,71 +276,29 @@ class AWSVariableDiscovery:
         Returns:
             Dictionary of variable -> suggested_canonical mapping
         """
-        suggestions = {}
+        names = sorted(unmapped_vars)
+        if not names:
+            return {}
+        lowered = np.char.lower(np.array(names, dtype=str))
         
-        # Common AWS API naming patterns
-        patterns = {
-            # Temperature
-            ('t2m', 't_2m', 'temp_2m', 'air_temp_2m'): 'temperature_2m',
-            ('tmax', 't2m_max', 'temp_max'): 'temperature_2m_max',
-            ('tmin', 't2m_min', 'temp_min'): 'temperature_2m_min',
-            ('td', 'td2m', 'dew_point', 'dew_2m'): 'dewpoint_2m',
-            
-            # Wind
-            ('u10', 'v10', 'ws_10m', 'wspd_10m'): 'wind_speed_10m',
-            ('wdir_10m', 'wd_10m'): 'wind_direction_10m',
-            ('gust', 'gust_10m', 'wg_10m'): 'wind_gusts_10m',
-            
-            # Precipitation
-            ('precip', 'rain', 'rainfall', 'tp'): 'precipitation',
-            
-            # Humidity
-            ('rh', 'rh_2m', 'rel_hum'): 'relative_humidity_2m',
-            
-            # Pressure
-            ('mslp', 'pmsl', 'slp'): 'pressure_msl',
-            ('ps', 'sfc_pres'): 'surface_pressure',
-            
-            # Clouds
-            ('tcc', 'cld', 'cloudcover'): 'cloud_cover',
-            
-            # Radiation - IMPORTANT AWS-SPECIFIC MAPPINGS
-            ('sw_dn_avg', 'sw_dn', 'ghi_avg', 'swdown'): 'shortwave_radiation',
-            ('dni_avg', 'dni', 'sw_dir'): 'direct_radiation',
-            ('dhi_avg', 'dhi', 'sw_diff'): 'diffuse_radiation',
-            ('lw_dn', 'lw_down', 'lwdown'): 'longwave_radiation',
-            
-            # Solar-specific (GSO model)
-            ('ghi', 'global_horizontal_irradiance'): 'shortwave_radiation',
-            ('gti', 'global_tilted_irradiance'): 'tilted_radiation',
-            ('poa', 'plane_of_array'): 'poa_radiation',
-        }
+        # Exact aliases first, as plain dict lookups ('' marks no match yet)
+        matched = np.array([_ALIAS_TO_CANONICAL.get(name, '') for name in lowered], dtype=object)
         
-        for var in unmapped_vars:
-            var_lower = var.lower()
-            
-            # Check against patterns
-            for pattern_vars, canonical in patterns.items():
-                if var_lower in pattern_vars or any(p in var_lower for p in pattern_vars):
-                    suggestions[var] = canonical
-                    break
-            
-            # If no pattern match, use heuristics
-            if var not in suggestions:
-                if '2m' in var_lower and ('temp' in var_lower or 't' == var_lower[0]):
-                    suggestions[var] = 'temperature_2m'
-                elif '10m' in var_lower and 'wind' in var_lower:
-                    suggestions[var] = 'wind_speed_10m'
-                elif 'precip' in var_lower or 'rain' in var_lower:
-                    suggestions[var] = 'precipitation'
-                elif 'humid' in var_lower or 'rh' in var_lower:
-                    suggestions[var] = 'relative_humidity_2m'
-                elif 'pressure' in var_lower or 'pres' in var_lower:
-                    suggestions[var] = 'surface_pressure'
-                elif 'cloud' in var_lower:
-                    suggestions[var] = 'cloud_cover'
-                elif any(x in var_lower for x in ['sw', 'solar', 'irrad', 'ghi', 'rad']):
-                    suggestions[var] = 'shortwave_radiation'
+        # Then one vectorized substring test per alias, in priority order, filling only
+        # names that are still unmatched so the first matching pattern wins
+        for alias, canonical in _SUBSTRING_PATTERNS:
+            mask = (matched == '') & (np.char.find(lowered, alias) >= 0)
+            matched[mask] = canonical
+        
+        suggestions = {}
+        for var, var_lower, canonical in zip(names, lowered, matched):
+            if canonical:
+                suggestions[var] = canonical
+            else:
+                # If no pattern match, use heuristics (group name is the suggested canonical)
+                match = _HEURISTIC_RE.match(var_lower)
+                if match:
+                    suggestions[var] = match.lastgroup
         
         return suggestions
     
@@ -244,54 +310,59 @@ class AWSVariableDiscovery:
             results: Results dictionary from discover_all_variables()
             show_all_vars: If True, print all variables for each model
         """
-        print("\n" + "=" * 60)
-        print("📋 Detailed Variable Report")
-        print("=" * 60)
+        # Collect the report and write it once rather than a print per line
+        lines = []
+        
+        lines.append("\n" + "=" * 60)
+        lines.append("📋 Detailed Variable Report")
+        lines.append("=" * 60)
         
         # Print per-model breakdown
         for model, data in results['models'].items():
-            print(f"\n{'─' * 60}")
-            print(f"🔹 {model.upper()}")
-            print(f"{'─' * 60}")
+            lines.append(f"\n{'─' * 60}")
+            lines.append(f"🔹 {model.upper()}")
+            lines.append(f"{'─' * 60}")
             
             if data['has_domains']:
                 for domain, vars_list in data['domains'].items():
-                    print(f"  Domain: {domain} ({len(vars_list)} variables)")
+                    lines.append(f"  Domain: {domain} ({len(vars_list)} variables)")
                     if show_all_vars:
                         for var in sorted(vars_list):
                             canonical = self.mapper.to_canonical(var)
                             mapped_status = "✓" if canonical != var else "○"
-                            print(f"    {mapped_status} {var:30s} → {canonical}")
+                            lines.append(f"    {mapped_status} {var:30s} → {canonical}")
             else:
-                print(f"  {len(data['variables'])} variables")
+                lines.append(f"  {len(data['variables'])} variables")
                 if show_all_vars:
                     for var in sorted(data['variables']):
                         canonical = self.mapper.to_canonical(var)
                         mapped_status = "✓" if canonical != var else "○"
-                        print(f"    {mapped_status} {var:30s} → {canonical}")
+                        lines.append(f"    {mapped_status} {var:30s} → {canonical}")
         
         # Print unmapped variables with suggestions
         if results['unmapped_variables']:
-            print(f"\n{'=' * 60}")
-            print(f"🔍 Unmapped Variables ({len(results['unmapped_variables'])})")
-            print(f"{'=' * 60}")
+            lines.append(f"\n{'=' * 60}")
+            lines.append(f"🔍 Unmapped Variables ({len(results['unmapped_variables'])})")
+            lines.append(f"{'=' * 60}")
             
             for var in sorted(results['unmapped_variables']):
                 suggestion = results['suggested_mappings'].get(var, '❓ unknown')
-                print(f"  {var:35s} → {suggestion}")
+                lines.append(f"  {var:35s} → {suggestion}")
         
         # Print mapping statistics
-        print(f"\n{'=' * 60}")
-        print(f"📈 Mapping Statistics")
-        print(f"{'=' * 60}")
+        lines.append(f"\n{'=' * 60}")
+        lines.append(f"📈 Mapping Statistics")
+        lines.append(f"{'=' * 60}")
         total = len(results['all_unique_variables'])
         mapped = total - len(results['unmapped_variables'])
         percentage = (mapped / total * 100) if total > 0 else 0
         
-        print(f"  Total unique variables: {total}")
-        print(f"  Already mapped: {mapped} ({percentage:.1f}%)")
-        print(f"  Unmapped: {len(results['unmapped_variables'])}")
-        print(f"  Suggested mappings: {len(results['suggested_mappings'])}")
+        lines.append(f"  Total unique variables: {total}")
+        lines.append(f"  Already mapped: {mapped} ({percentage:.1f}%)")
+        lines.append(f"  Unmapped: {len(results['unmapped_variables'])}")
+        lines.append(f"  Suggested mappings: {len(results['suggested_mappings'])}")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def generate_mapping_code(self, results: Dict) -> str:
         """
@@ -309,27 +380,49 @@ class AWSVariableDiscovery:
             ""
         ]
         
-        # Group suggestions by canonical name
-        by_canonical = defaultdict(set)
-        for aws_var, canonical in results['suggested_mappings'].items():
-            by_canonical[canonical].add(aws_var)
-        
-        for canonical in sorted(by_canonical.keys()):
-            aws_vars = sorted(by_canonical[canonical])
+        # Sort by (canonical, variable) once and emit each canonical group in a single pass
+        items = sorted(results['suggested_mappings'].items(), key=lambda kv: (kv[1], kv[0]))
+        for canonical, group in groupby(items, key=lambda kv: kv[1]):
             code_lines.append(f"# AWS API variables for {canonical}:")
             code_lines.append(f"'{canonical}': {{")
             code_lines.append(f"    '{canonical}',  # canonical name")
-            for var in aws_vars:
-                code_lines.append(f"    '{var}',  # AWS API")
+            code_lines.extend(f"    '{var}',  # AWS API" for var, _ in group)
             code_lines.append(f"}},")
             code_lines.append("")
         
         return "\n".join(code_lines)
 
 
+def results_to_jsonable(results: Dict) -> Dict:
+    """
+    Convert discovery results to JSON-serializable form (sets become sorted lists)
+    
+    Args:
+        results: Results from discover_all_variables()
+    
+    Returns:
+        Copy of results that json.dump can write
+    """
+    return {
+        **results,
+        'all_unique_variables': sorted(results['all_unique_variables']),
+        'unmapped_variables': sorted(results['unmapped_variables']),
+        'models': {
+            model: {**data, 'variables': sorted(data['variables'])}
+            for model, data in results['models'].items()
+        }
+    }
+
+
 def main():
     """Main entry point for variable discovery"""
-    import getpass
+    parser = argparse.ArgumentParser(description="Discover and map variables from AWS API models")
+    parser.add_argument('--user-pool-id', help="Cognito User Pool ID (e.g., ap-southeast-2_XXXXXXXXX)")
+    parser.add_argument('--client-id', help="Cognito App Client ID")
+    parser.add_argument('--username', help="Cognito username")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Ignore cached variable lists and query the API for every model")
+    args = parser.parse_args()
     
     print("\n🔐 AWS API Variable Discovery Tool")
     print("=" * 60)
@@ -337,21 +430,32 @@ def main():
     print("and suggest mappings to canonical variable names.")
     print("=" * 60)
     
-    # Get credentials
-    print("\nPlease enter your AWS credentials:")
-    user_pool_id = input("User Pool ID (e.g., ap-southeast-2_XXXXXXXXX): ").strip()
-    client_id = input("Client ID (e.g., xxxxxxxxxxxxxxxxxxxxx): ").strip()
-    username = input("Username: ").strip()
-    password = getpass.getpass("Password: ")
+    # Get credentials from the command line and AWS_COGNITO_PASSWORD, prompting only
+    # for what is missing and only when running interactively
+    user_pool_id = args.user_pool_id
+    client_id = args.client_id
+    username = args.username
+    password = os.environ.get('AWS_COGNITO_PASSWORD')
+    
+    if sys.stdin.isatty() and not all([user_pool_id, client_id, username, password]):
+        print("\nPlease enter your AWS credentials:")
+        if not user_pool_id:
+            user_pool_id = input("User Pool ID (e.g., ap-southeast-2_XXXXXXXXX): ").strip()
+        if not client_id:
+            client_id = input("Client ID (e.g., xxxxxxxxxxxxxxxxxxxxx): ").strip()
+        if not username:
+            username = input("Username: ").strip()
+        if not password:
+            password = getpass.getpass("Password: ")
     
     if not all([user_pool_id, client_id, username, password]):
-        print("❌ All credentials are required")
+        print("❌ All credentials are required (--user-pool-id, --client-id, --username "
+              "and AWS_COGNITO_PASSWORD when not running interactively)")
         return 1
     
     # Authenticate
     print("\n🔑 Authenticating...")
     try:
-        from utils.cognito_auth import CognitoAuth
         auth = CognitoAuth(user_pool_id, client_id)
         success, id_token, error = auth.authenticate(username, password)
         
@@ -368,7 +472,7 @@ def main():
     # Create client and discovery tool
     base_url = 'https://fmeq0xvw60.execute-api.ap-southeast-2.amazonaws.com/prod'
     client = AWSAPIClient(base_url, id_token)
-    discovery = AWSVariableDiscovery(client)
+    discovery = AWSVariableDiscovery(client, use_cache=not args.no_cache)
     
     # Discover variables
     print("\n🔍 Discovering variables from AWS API...")
@@ -386,20 +490,31 @@ def main():
     
     # Save to file
     output_file = 'aws_variable_mappings.txt'
+    report_lines = [
+        "AWS API Variable Discovery Report",
+        "=" * 60,
+        "",
+        f"Total unique variables: {len(results['all_unique_variables'])}",
+        f"Unmapped: {len(results['unmapped_variables'])}",
+        "",
+        "Suggested Mappings:",
+        "-" * 60,
+    ]
+    for var in sorted(results['unmapped_variables']):
+        suggestion = results['suggested_mappings'].get(var, 'unknown')
+        report_lines.append(f"{var:35s} → {suggestion}")
+    
+    # Assemble the report and write it in one call
     with open(output_file, 'w') as f:
-        f.write("AWS API Variable Discovery Report\n")
-        f.write("=" * 60 + "\n\n")
-        f.write(f"Total unique variables: {len(results['all_unique_variables'])}\n")
-        f.write(f"Unmapped: {len(results['unmapped_variables'])}\n\n")
-        f.write("Suggested Mappings:\n")
-        f.write("-" * 60 + "\n")
-        for var in sorted(results['unmapped_variables']):
-            suggestion = results['suggested_mappings'].get(var, 'unknown')
-            f.write(f"{var:35s} → {suggestion}\n")
-        f.write("\n\n")
-        f.write(code)
+        f.write("\n".join(report_lines) + "\n\n\n" + code)
+    
+    # Structured copy of the results for scripted re-runs and diffing
+    json_file = 'aws_variable_mappings.json'
+    with open(json_file, 'w') as f:
+        json.dump(results_to_jsonable(results), f, separators=(',', ':'))
     
     print(f"\n✅ Report saved to: {output_file}")
+    print(f"✅ Results saved to: {json_file}")
     
     return 0
 
@@ -2,9 +2,24 @@
 """Plotting utilities for weather data"""
 
 import plotly.graph_objs as go
-from typing import Dict, List
+from typing import Dict, List, Optional, Union
+from datetime import datetime
+from functools import lru_cache
+from collections import deque
+import numpy as np
 import pandas as pd
+import pytz
 from config import YAXIS_TITLES, DETERMINISTIC_MODEL_COLORS, ENSEMBLE_MODEL_COLORS
+from utils.probability import ensemble_quantiles, ensemble_tensor
+
+# tsdownsample provides a fast (Rust) MinMaxLTTB implementation; optional
+try:
+    from tsdownsample import MinMaxLTTBDownsampler
+except ImportError:
+    MinMaxLTTBDownsampler = None
+
+# Default cap on points per forecast trace; more than this is not visible at dashboard width
+MAX_PLOT_POINTS = 2000
 
 # Fallback color palette for models not in the config
 FALLBACK_COLORS = [
@@ -15,44 +30,364 @@ FALLBACK_COLORS = [
 ]
 
 
+# Layout shared by every forecast figure; go.Figure copies it, so it can be shared
+_BASE_LAYOUT = dict(
+    xaxis=dict(showgrid=True, title='Forecast Time'),
+    yaxis=dict(showgrid=True),
+    hovermode="x unified",
+    margin=dict(l=30, r=30, t=30, b=30),
+    template="simple_white"
+)
+
+# Horizontal legend below the plot
+_BOTTOM_LEGEND = dict(orientation="h", yanchor="bottom", y=-0.3, xanchor="left", x=0)
+
+# Style of the "Now" marker; plotly copies these into each figure, so they can be shared
+_NOW_LINE_STYLE = dict(color="red", width=2, dash="dash")
+_NOW_FONT = dict(color="red", size=12)
+
+# Threshold lines on ensemble plots; only the color and y value vary per threshold
+_THRESHOLD_COLORS = ['orange', 'purple', 'brown']
+_THRESHOLD_LINE_STYLE = dict(width=2, dash="dot")
+_THRESHOLD_LABEL_STYLE = dict(x=1.01, xref="paper", showarrow=False, xanchor="left", yanchor="middle")
+
+# Fixed tail of the exceedance hover text
+_EXCEEDANCE_HOVER_SUFFIX = '<br>Probability: %{y:.1f}%<extra></extra>'
+
+# UTC is the default display timezone, so it skips the pytz lookup entirely
+_UTC = pytz.UTC
+
+
+@lru_cache(maxsize=32)
+def _get_tz(name: str):
+    """Return the pytz timezone for a name, caching the zoneinfo lookup"""
+    if name == 'UTC':
+        return _UTC
+    return pytz.timezone(name)
+
+
+def _convert_tz(values, tz):
+    """
+    Convert a datetime Series or DatetimeIndex to a timezone
+    
+    Args:
+        values: Datetime Series or DatetimeIndex; naive values are taken as UTC
+        tz: Target timezone
+    
+    Returns:
+        Converted values, or the input itself if it is already in that timezone
+    """
+    is_series = isinstance(values, pd.Series)
+    current_tz = values.dt.tz if is_series else values.tz
+    if current_tz is None:
+        if str(tz) == 'UTC':
+            # Naive UTC shown in UTC: the same wall-clock times, no localized copy
+            return values
+        values = values.dt.tz_localize('UTC') if is_series else values.tz_localize('UTC')
+        current_tz = 'UTC'
+    if str(current_tz) == str(tz):
+        # Already in the target zone; skip allocating an identical copy
+        return values
+    return values.dt.tz_convert(tz) if is_series else values.tz_convert(tz)
+
+
+def _wall_times(values) -> np.ndarray:
+    """
+    Plain NumPy array of x values, with tz-aware datetimes as naive wall-clock times
+    
+    plotly draws the wall-clock time of a timestamp and ignores its UTC offset, so
+    dropping the zone does not move any point, and a datetime64 array serializes far
+    faster than tz-aware Timestamps (each boxed and formatted with its offset).
+    
+    Args:
+        values: Series, Index or array of x values
+    
+    Returns:
+        NumPy array
+    """
+    if isinstance(values, pd.Series):
+        if isinstance(values.dtype, pd.DatetimeTZDtype):
+            values = values.dt.tz_localize(None)
+        return values.to_numpy()
+    if isinstance(values, pd.DatetimeIndex) and values.tz is not None:
+        values = values.tz_localize(None)
+    return np.asarray(values)
+
+
+def _obs_times(df_obs: pd.DataFrame, tz):
+    """
+    Observation times in the display timezone, without copying the observation frame
+    
+    A 'datetime' column that is not datetime64 yet (e.g. ISO strings) is parsed once
+    as UTC, with pandas' cache so repeated timestamps are only parsed once.
+    
+    Args:
+        df_obs: Observations with a 'datetime' column or a DatetimeIndex
+        tz: Target timezone; naive times are taken as UTC
+    
+    Returns:
+        Converted 'datetime' column if present, otherwise the (converted) index, as
+        wall-clock times (see _wall_times)
+    """
+    if 'datetime' in df_obs.columns:
+        obs_times = df_obs['datetime']
+        if not pd.api.types.is_datetime64_any_dtype(obs_times):
+            obs_times = pd.to_datetime(obs_times, utc=True, cache=True)
+        return _wall_times(_convert_tz(obs_times, tz))
+    if isinstance(df_obs.index, pd.DatetimeIndex):
+        return _wall_times(_convert_tz(df_obs.index, tz))
+    return _wall_times(df_obs.index)
+
+
+def _resolve_timezone(timezone: str):
+    """
+    Look up the display timezone once, falling back to UTC for unknown names
+    
+    Args:
+        timezone: Timezone name
+    
+    Returns:
+        Tuple of (tz, label for the "Now" marker)
+    """
+    try:
+        return _get_tz(timezone), "Now"
+    except pytz.UnknownTimeZoneError:
+        print(f"Warning: Unknown timezone '{timezone}', using UTC")
+        return _UTC, "Now (UTC)"
+
+
+def _now_marker(tz, label: str = "Now"):
+    """
+    Dashed vertical line and label marking the current time, as layout dicts
+    
+    Args:
+        tz: Timezone for the current time
+        label: Annotation text for the line
+    
+    Returns:
+        Tuple of (shape, annotation) for the layout's shapes/annotations lists
+    """
+    current_time = datetime.now(tz)
+    shape = dict(
+        type="line",
+        x0=current_time,
+        x1=current_time,
+        y0=0,
+        y1=1,
+        yref="paper",
+        line=_NOW_LINE_STYLE
+    )
+    annotation = dict(
+        x=current_time,
+        y=1.02,
+        yref="paper",
+        text=label,
+        showarrow=False,
+        font=_NOW_FONT,
+        xanchor="left"
+    )
+    return shape, annotation
+
+
+def _stack_members(x_data, member_values: np.ndarray):
+    """
+    Flatten ensemble members into single x/y arrays, one member after another with a
+    gap (None/NaN) between them, so they can be drawn as one trace of separate lines
+    
+    Args:
+        x_data: x values shared by every member
+        member_values: Array of shape (time, member)
+    
+    Returns:
+        Tuple of (x values, y values)
+    """
+    n_times, n_members = member_values.shape
+    
+    # Repeat the x positions per member; position n_times is out of range and
+    # reindexes to NaT/NaN, giving the gap
+    positions = np.tile(np.arange(n_times + 1), n_members)
+    xs = pd.Series(x_data).reset_index(drop=True).reindex(positions)
+    
+    # (time, member) plus a trailing NaN row, read member by member
+    gap = np.full((1, n_members), np.nan, dtype=member_values.dtype)
+    ys = np.vstack([member_values, gap]).T.ravel()
+    return xs, ys
+
+
+def _downsample_indices(y, max_points: Optional[int]) -> Optional[np.ndarray]:
+    """
+    Pick the indices of the points worth drawing for a long series
+    
+    Uses MinMaxLTTB from tsdownsample when installed, otherwise keeps the min and
+    max of each bucket, so peaks and troughs survive either way.
+    
+    Args:
+        y: Series values (assumed evenly spaced in x)
+        max_points: Maximum number of points to keep; None or 0 disables downsampling
+    
+    Returns:
+        Sorted array of indices to keep, or None if the series is short enough
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if not max_points or n <= max_points:
+        return None
+    
+    if MinMaxLTTBDownsampler is not None and not np.isnan(y).any():
+        return np.asarray(MinMaxLTTBDownsampler().downsample(y, n_out=max_points))
+    
+    # Fallback: min and max of each bucket plus both end points
+    edges = np.linspace(0, n, max(max_points // 2, 1) + 1).astype(int)
+    keep = [0, n - 1]
+    for start, stop in zip(edges[:-1], edges[1:]):
+        bucket = y[start:stop]
+        if np.isnan(bucket).all():
+            # Keep one point so gaps in the data stay gaps
+            keep.append(start)
+            continue
+        keep.append(start + np.nanargmin(bucket))
+        keep.append(start + np.nanargmax(bucket))
+    return np.unique(keep)
+
+
+def _take(values, idx: Optional[np.ndarray]):
+    """Select positions idx from a Series/Index/array (all of it if idx is None)"""
+    if idx is None:
+        return values
+    if isinstance(values, pd.Series):
+        return values.iloc[idx]
+    if isinstance(values, pd.Index):
+        return values[idx]
+    return np.asarray(values)[idx]
+
+
+def lttb_downsample(x, y, max_points: Optional[int] = MAX_PLOT_POINTS):
+    """
+    Downsample a series for plotting, keeping its visual shape
+    
+    Args:
+        x: x values
+        y: y values
+        max_points: Maximum number of points to keep; None or 0 disables downsampling
+    
+    Returns:
+        Tuple of (x, y), unchanged if the series already has few enough points
+    """
+    idx = _downsample_indices(y, max_points)
+    return _take(x, idx), _take(y, idx)
+
+
+def _group_columns_by_variable(columns, variables: List[str]) -> Dict[str, List[str]]:
+    """
+    Assign each '{variable}_{model}' (or bare '{variable}') column to its variable in one pass
+    
+    The longest matching variable wins, so e.g. 'precipitation_probability_gfs' is not
+    also plotted as a 'precipitation' model.
+    
+    Args:
+        columns: Column names of the forecast DataFrame
+        variables: Selected variable names
+    
+    Returns:
+        Dictionary mapping each variable to its columns (in column order)
+    """
+    by_var = {variable: [] for variable in variables}
+    for col in columns:
+        # Strip '_<part>' suffixes until a selected variable is left (or nothing is)
+        variable = col
+        while variable not in by_var and '_' in variable:
+            variable = variable.rsplit('_', 1)[0]
+        if variable in by_var and col != 'datetime':
+            by_var[variable].append(col)
+    return by_var
+
+
+def _band_polygon(x_data, upper: np.ndarray, lower: np.ndarray):
+    """
+    Outline of a percentile band as one closed polygon for fill='toself'
+    
+    Timesteps where either bound is NaN are left out, since a gap would split the
+    polygon in two.
+    
+    Args:
+        x_data: x values shared by both bounds
+        upper: Upper bound values
+        lower: Lower bound values
+    
+    Returns:
+        Tuple of (x values, y values): forward along upper, then back along lower
+    """
+    valid = np.flatnonzero(~(np.isnan(upper) | np.isnan(lower)))
+    x_valid = _take(x_data, valid)
+    if isinstance(x_valid, pd.Series):
+        poly_x = pd.concat([x_valid, x_valid.iloc[::-1]], ignore_index=True)
+    elif isinstance(x_valid, pd.Index):
+        poly_x = x_valid.append(x_valid[::-1])
+    else:
+        poly_x = np.concatenate([x_valid, x_valid[::-1]])
+    poly_y = np.concatenate([upper[valid], lower[valid][::-1]])
+    return poly_x, poly_y
+
+
+@lru_cache(maxsize=128)
 def get_yaxis_title(column: str) -> str:
-    """Get Y-axis title for a variable"""
+    """Get Y-axis title for a variable (cached; YAXIS_TITLES is fixed at import)"""
     return YAXIS_TITLES.get(column, column.replace('_', ' ').title())
 
 
-def get_model_color(model_name: str, color_map: Dict, used_colors: set = None) -> str:
+@lru_cache(maxsize=256)
+def _partial_color_key(model_name: str, keys: tuple) -> Optional[str]:
+    """First color map key contained in (or containing) the model name, cached per key set"""
+    for key in keys:
+        if key in model_name or model_name in key:
+            return key
+    return None
+
+
+def new_color_rotation() -> deque:
+    """Fresh fallback palette rotation for get_model_color (one per plot)"""
+    return deque(FALLBACK_COLORS)
+
+
+def get_model_color(model_name: str, color_map: Dict, used_colors: Union[deque, set] = None) -> str:
     """
     Get color for a model with fallback to palette if not in map
     
     Args:
         model_name: Name of the model
         color_map: Dictionary mapping model names to colors
-        used_colors: Set of colors already used (to avoid duplicates)
+        used_colors: Fallback palette rotation shared across a plot (from
+            new_color_rotation()), so unmapped models get distinct colors; a set of
+            colors already used is also accepted
     
     Returns:
         Color string (hex code)
     """
     if used_colors is None:
-        used_colors = set()
+        used_colors = new_color_rotation()
     
     # First try exact match in color map
     if model_name in color_map:
         return color_map[model_name]
     
     # Try partial matches (in case of model name variations)
-    for key in color_map:
-        if key in model_name or model_name in key:
-            return color_map[key]
-    
-    # Use fallback palette, cycling through unused colors first
-    for color in FALLBACK_COLORS:
-        if color not in used_colors:
-            used_colors.add(color)
-            return color
-    
-    # If all colors used, cycle through again
-    idx = len(used_colors) % len(FALLBACK_COLORS)
-    return FALLBACK_COLORS[idx]
+    key = _partial_color_key(model_name, tuple(color_map))
+    if key is not None:
+        return color_map[key]
+    
+    if isinstance(used_colors, set):
+        # Set of used colors: the first unused palette color, then cycle through again
+        for color in FALLBACK_COLORS:
+            if color not in used_colors:
+                used_colors.add(color)
+                return color
+        return FALLBACK_COLORS[len(used_colors) % len(FALLBACK_COLORS)]
+    
+    # Use fallback palette: take the next color and rotate it to the back, so the
+    # palette is used in order and then cycles
+    color = used_colors.popleft()
+    used_colors.append(color)
+    return color
 
 
 def create_deterministic_plot(
@@ -62,7 +397,8 @@ def create_deterministic_plot(
     color_map: Dict,
     data_type: str,
     df_obs: pd.DataFrame = None,
-    timezone: str = 'UTC'
+    timezone: str = 'UTC',
+    max_points: Optional[int] = MAX_PLOT_POINTS
 ) -> go.Figure:
     """
     Create time series plot for deterministic forecasts
@@ -75,51 +411,47 @@ def create_deterministic_plot(
         data_type: Type of data ('hourly' or 'daily')
         df_obs: Optional DataFrame with observation data to overlay
         timezone: Timezone for displaying dates (default: 'UTC')
+        max_points: Maximum points per forecast trace (longer series are downsampled);
+            None disables downsampling
     
     Returns:
         Plotly Figure object
     """
-    import pytz
-    from datetime import datetime
-    
-    fig = go.Figure()
+    traces = []
     y_axis_label_set = False
     
-    # Prepare dataframe with datetime handling
-    df_plot = df.copy()
+    # Look up the display timezone once (unknown names fall back to UTC)
+    tz, now_label = _resolve_timezone(timezone)
     
     # Ensure we have datetime data for x-axis
-    if 'datetime' in df_plot.columns:
-        x_data = df_plot['datetime']
+    if 'datetime' in df.columns:
+        x_data = df['datetime']
         # Convert to specified timezone if needed
-        try:
-            tz = pytz.timezone(timezone)
-            if pd.api.types.is_datetime64_any_dtype(x_data):
-                if x_data.dt.tz is None:
-                    x_data = x_data.dt.tz_localize('UTC').dt.tz_convert(tz)
-                else:
-                    x_data = x_data.dt.tz_convert(tz)
-        except Exception as e:
-            pass  # If conversion fails, use original timezone
-    elif isinstance(df_plot.index, pd.DatetimeIndex):
+        if pd.api.types.is_datetime64_any_dtype(x_data):
+            x_data = _convert_tz(x_data, tz)
+    elif isinstance(df.index, pd.DatetimeIndex):
         # Fallback to index if datetime column not present
-        x_data = df_plot.index
-        try:
-            tz = pytz.timezone(timezone)
-            if x_data.tz is None:
-                x_data = x_data.tz_localize('UTC').tz_convert(tz)
-            else:
-                x_data = x_data.tz_convert(tz)
-        except Exception as e:
-            pass
+        x_data = _convert_tz(df.index, tz)
     else:
         raise ValueError("DataFrame must have either 'datetime' column or DatetimeIndex")
     
+    # One naive datetime64 array of wall-clock times for every trace (see _wall_times)
+    x_data = _wall_times(x_data)
+    
     # Track used colors to ensure variety
-    used_colors = set()
+    used_colors = new_color_rotation()
+    
+    # Group the forecast columns by variable once instead of scanning them per variable
+    columns_by_variable = _group_columns_by_variable(df.columns, selected_columns)
+    
+    # Convert the plotted columns to one float32 block up front; float32 also halves
+    # the size of the arrays plotly sends to the browser
+    plot_columns = [col for cols in columns_by_variable.values() for col in cols]
+    col_idx = {col: i for i, col in enumerate(plot_columns)}
+    data = df[plot_columns].to_numpy(dtype=np.float32)
     
     for selected_column in selected_columns:
-        cols_to_plot = [col for col in df_plot.columns if selected_column in col and col != 'datetime']
+        cols_to_plot = columns_by_variable[selected_column]
         
         if not y_axis_label_set:
             y_axis_label = get_yaxis_title(selected_column)
@@ -128,137 +460,56 @@ def create_deterministic_plot(
         for col in cols_to_plot:
             cleaned_col = col.replace(selected_column, '').strip('_')
             color = get_model_color(cleaned_col, color_map, used_colors)
+            x_plot, y_plot = lttb_downsample(x_data, data[:, col_idx[col]], max_points)
 
-            fig.add_trace(go.Scatter(
-                x=x_data, 
-                y=df_plot[col], 
+            traces.append(dict(
+                type='scatter',
+                x=x_plot, 
+                y=y_plot, 
                 mode='lines', 
                 name=f"{cleaned_col} ({all_variables_map[selected_column]['label']})", 
                 line=dict(color=color)
             ))
     
+    # Nothing to draw: skip the layout, observation and marker work
+    if not traces and (df_obs is None or df_obs.empty):
+        return go.Figure(layout=dict(title='No data'))
+    
     # Add observation data if available
     if df_obs is not None and not df_obs.empty:
-        df_obs_plot = df_obs.copy()
-        
-        # Convert observation times to specified timezone
-        if timezone != 'UTC':
-            try:
-                tz = pytz.timezone(timezone)
-                if 'datetime' in df_obs_plot.columns:
-                    if df_obs_plot['datetime'].dt.tz is None:
-                        df_obs_plot['datetime'] = df_obs_plot['datetime'].dt.tz_localize('UTC').dt.tz_convert(tz)
-                    else:
-                        df_obs_plot['datetime'] = df_obs_plot['datetime'].dt.tz_convert(tz)
-                elif hasattr(df_obs_plot.index, 'tz_localize'):
-                    if df_obs_plot.index.tz is None:
-                        df_obs_plot.index = df_obs_plot.index.tz_localize('UTC').tz_convert(tz)
-                    else:
-                        df_obs_plot.index = df_obs_plot.index.tz_convert(tz)
-            except Exception:
-                pass  # If conversion fails, use original timezone
+        # Observation times in the specified timezone (datetime column, else index)
+        obs_x = _obs_times(df_obs, tz)
         
         for selected_column in selected_columns:
-            if selected_column in df_obs_plot.columns:
-                # Use datetime column if available, otherwise use index
-                if 'datetime' in df_obs_plot.columns:
-                    x_data = df_obs_plot['datetime']
-                else:
-                    x_data = df_obs_plot.index
-                
-                fig.add_trace(go.Scatter(
-                    x=x_data,
-                    y=df_obs_plot[selected_column],
+            if selected_column in df_obs.columns:
+                traces.append(dict(
+                    type='scatter',
+                    x=obs_x,
+                    y=df_obs[selected_column],
                     mode='markers',
                     name=f'Observations ({selected_column})',
                     marker=dict(color='black', size=4, symbol='circle'),
                     line=dict(color='black', width=2)
                 ))
 
-    fig.update_layout(
+    # Vertical line for current time
+    now_shape, now_annotation = _now_marker(tz, now_label)
+    
+    layout = dict(
+        _BASE_LAYOUT,
         title=f'{data_type.capitalize()} Forecast Data',
         yaxis_title=y_axis_label,
-        legend=dict(
-            title='Model & Variable',
-            font=dict(size=10),
-            orientation="h",
-            yanchor="bottom",
-            y=-0.3, 
-            xanchor="left",
-            x=0
-        ),
-        xaxis=dict(showgrid=True, title='Forecast Time'),
-        yaxis=dict(showgrid=True),
-        hovermode="x unified",
-        margin=dict(l=30, r=30, t=30, b=30),
-        template="simple_white"
+        legend=dict(_BOTTOM_LEGEND, title='Model & Variable', font=dict(size=10)),
+        shapes=[now_shape],
+        annotations=[now_annotation]
     )
-    
-    # Add vertical line for current time
-    try:
-        tz = pytz.timezone(timezone)
-        current_time = datetime.now(tz)
-        
-        # Add vertical line using shape
-        fig.add_shape(
-            type="line",
-            x0=current_time,
-            x1=current_time,
-            y0=0,
-            y1=1,
-            yref="paper",
-            line=dict(
-                color="red",
-                width=2,
-                dash="dash"
-            )
-        )
-        
-        # Add annotation for the line
-        fig.add_annotation(
-            x=current_time,
-            y=1.02,
-            yref="paper",
-            text="Now",
-            showarrow=False,
-            font=dict(color="red", size=12),
-            xanchor="left"
-        )
-    except Exception as e:
-        # Fallback to UTC if timezone fails
-        try:
-            current_time = datetime.now(pytz.UTC)
-            fig.add_shape(
-                type="line",
-                x0=current_time,
-                x1=current_time,
-                y0=0,
-                y1=1,
-                yref="paper",
-                line=dict(
-                    color="red",
-                    width=2,
-                    dash="dash"
-                )
-            )
-            fig.add_annotation(
-                x=current_time,
-                y=1.02,
-                yref="paper",
-                text="Now (UTC)",
-                showarrow=False,
-                font=dict(color="red", size=12),
-                xanchor="left"
-            )
-        except Exception:
-            pass  # If this also fails, skip the current time line
-    
-    return fig
+    return go.Figure(data=traces, layout=layout)
 
 
+@lru_cache(maxsize=256)
 def hex_to_rgba(hex_color: str, alpha: float = 1.0) -> str:
     """
-    Convert hex color to rgba string
+    Convert hex color to rgba string (cached; the palette is small and fixed)
     
     Args:
         hex_color: Hex color string (e.g., '#FF5733')
@@ -267,11 +518,8 @@ def hex_to_rgba(hex_color: str, alpha: float = 1.0) -> str:
     Returns:
         RGBA color string
     """
-    hex_color = hex_color.lstrip('#')
-    r = int(hex_color[0:2], 16)
-    g = int(hex_color[2:4], 16)
-    b = int(hex_color[4:6], 16)
-    return f'rgba({r}, {g}, {b}, {alpha})'
+    value = int(hex_color.lstrip('#')[:6], 16)
+    return f'rgba({(value >> 16) & 0xFF}, {(value >> 8) & 0xFF}, {value & 0xFF}, {alpha})'
 
 
 def create_ensemble_plot(
@@ -283,7 +531,8 @@ def create_ensemble_plot(
     show_members: bool = False,
     df_obs: pd.DataFrame = None,
     timezone: str = 'UTC',
-    thresholds: List[float] = None
+    thresholds: List[float] = None,
+    max_points: Optional[int] = MAX_PLOT_POINTS
 ) -> go.Figure:
     """
     Create ensemble forecast plot with percentiles and/or individual members
@@ -298,291 +547,242 @@ def create_ensemble_plot(
         df_obs: Optional DataFrame with observation data to overlay
         timezone: Timezone for displaying dates (default: 'UTC')
         thresholds: Optional list of threshold values to display as horizontal lines
-        show_percentiles: Whether to show percentile bands
-        show_members: Whether to show individual ensemble members
-        df_obs: Optional DataFrame with observation data to overlay
-        timezone: Timezone for displaying dates (default: 'UTC')
+        max_points: Maximum points per percentile trace (longer series are downsampled);
+            None disables downsampling
     
     Returns:
         Plotly Figure object
-    """
-    import pytz
-    from datetime import datetime
     
-    fig = go.Figure()
-    
-    # Prepare dataframe with datetime handling
-    df_plot = df.copy()
+    Note:
+        The member columns are reshaped once into a (time, model, member) array (see
+        ensemble_tensor) and drawn like create_ensemble_plot_arr.
+    """
+    # Look up the display timezone once (unknown names fall back to UTC)
+    tz, now_label = _resolve_timezone(timezone)
     
     # Ensure we have datetime data for x-axis
-    if 'datetime' in df_plot.columns:
-        x_data = df_plot['datetime']
+    if 'datetime' in df.columns:
+        x_data = df['datetime']
         # Convert to specified timezone if needed
-        try:
-            tz = pytz.timezone(timezone)
-            if pd.api.types.is_datetime64_any_dtype(x_data):
-                if x_data.dt.tz is None:
-                    x_data = x_data.dt.tz_localize('UTC').dt.tz_convert(tz)
-                else:
-                    x_data = x_data.dt.tz_convert(tz)
-        except Exception as e:
-            print(f"Warning: Could not convert forecast timezone: {e}")
-            pass  # If conversion fails, use original timezone
-    elif isinstance(df_plot.index, pd.DatetimeIndex):
+        if pd.api.types.is_datetime64_any_dtype(x_data):
+            x_data = _convert_tz(x_data, tz)
+    elif isinstance(df.index, pd.DatetimeIndex):
         # Fallback to index if datetime column not present
-        x_data = df_plot.index
-        try:
-            tz = pytz.timezone(timezone)
-            if x_data.tz is None:
-                x_data = x_data.tz_localize('UTC').tz_convert(tz)
-            else:
-                x_data = x_data.tz_convert(tz)
-        except Exception as e:
-            print(f"Warning: Could not convert forecast timezone: {e}")
-            pass
+        x_data = _convert_tz(df.index, tz)
     else:
         raise ValueError("DataFrame must have either 'datetime' column or DatetimeIndex")
     
+    return _ensemble_figure(
+        _wall_times(x_data), ensemble_tensor(df, variable, models), models, variable,
+        color_map, tz, now_label, show_percentiles, show_members, df_obs, thresholds,
+        max_points
+    )
+
+
+def create_ensemble_plot_arr(
+    x,
+    data: np.ndarray,
+    model_names: List[str],
+    variable: str,
+    color_map: Dict,
+    show_percentiles: bool = True,
+    show_members: bool = False,
+    df_obs: pd.DataFrame = None,
+    timezone: str = 'UTC',
+    thresholds: List[float] = None,
+    max_points: Optional[int] = MAX_PLOT_POINTS
+) -> go.Figure:
+    """
+    Create ensemble forecast plot from a (time, model, member) array
+    
+    Args:
+        x: Times of the rows of data (datetime64 array, Series or DatetimeIndex);
+            naive times are taken as UTC
+        data: Array of shape (time, model, member); models with fewer members are
+            padded with NaN (see ensemble_tensor)
+        model_names: Ensemble model names, in the order of the model axis
+        variable: Variable name to plot
+        color_map: Dictionary mapping models to colors
+        show_percentiles: Whether to show percentile bands
+        show_members: Whether to show individual ensemble members
+        df_obs: Optional DataFrame with observation data to overlay
+        timezone: Timezone for displaying dates (default: 'UTC')
+        thresholds: Optional list of threshold values to display as horizontal lines
+        max_points: Maximum points per percentile trace (longer series are downsampled);
+            None disables downsampling
+    
+    Returns:
+        Plotly Figure object
+    
+    Note:
+        Forecast traces are drawn with WebGL (Scattergl): member lines as one trace per
+        model and each percentile band as a single filled polygon (fill='toself'). All
+        of a model's traces share a legend group; observations stay SVG markers.
+    """
+    if data.ndim != 3 or data.shape[0] != len(x) or data.shape[1] != len(model_names):
+        raise ValueError("data must have shape (len(x), len(model_names), members)")
+    
+    tz, now_label = _resolve_timezone(timezone)
+    x_data = _wall_times(_convert_tz(pd.DatetimeIndex(x), tz))
+    
+    return _ensemble_figure(
+        x_data, data, model_names, variable, color_map, tz, now_label,
+        show_percentiles, show_members, df_obs, thresholds, max_points
+    )
+
+
+def _ensemble_figure(
+    x_data: np.ndarray,
+    data: np.ndarray,
+    model_names: List[str],
+    variable: str,
+    color_map: Dict,
+    tz,
+    now_label: str,
+    show_percentiles: bool,
+    show_members: bool,
+    df_obs: Optional[pd.DataFrame],
+    thresholds: Optional[List[float]],
+    max_points: Optional[int]
+) -> go.Figure:
+    """Build the ensemble figure from wall-clock x values and a (time, model, member) array"""
+    traces = []
+    
     # Track used colors to ensure variety
-    used_colors = set()
+    used_colors = new_color_rotation()
     
-    for model in models:
-        # Find all columns for this model and variable
-        model_cols = [col for col in df_plot.columns 
-                     if variable in col and model in col and '_member_' in col]
-        
-        if not model_cols:
+    for m, model in enumerate(model_names):
+        # Drop the NaN padding of models with fewer members than the largest ensemble
+        block = data[:, m, :]
+        present = ~np.isnan(block).all(axis=0)
+        if not present.any():
             continue
             
         color = get_model_color(model, color_map, used_colors)
-        ensemble_data = df_plot[model_cols]
+        # One contiguous float32 block per model (half the bytes plotly sends to the browser)
+        member_values = np.ascontiguousarray(block[:, present], dtype=np.float32)
         
         if show_percentiles:
-            # Calculate percentiles
-            p10 = ensemble_data.quantile(0.10, axis=1)
-            p25 = ensemble_data.quantile(0.25, axis=1)
-            p50 = ensemble_data.quantile(0.50, axis=1)
-            p75 = ensemble_data.quantile(0.75, axis=1)
-            p90 = ensemble_data.quantile(0.90, axis=1)
-            
-            # Add 10-90% band
-            fig.add_trace(go.Scatter(
-                x=x_data, 
-                y=p90,
-                mode='lines',
-                line=dict(width=0),
-                showlegend=False,
-                hoverinfo='skip',
-                name=f'{model}_p90'
-            ))
-            
-            fig.add_trace(go.Scatter(
-                x=x_data, 
-                y=p10,
-                mode='lines',
-                line=dict(width=0),
-                fillcolor=hex_to_rgba(color, 0.1),
-                fill='tonexty',
-                name=f'{model} 10-90%',
-                hoverinfo='skip'
-            ))
+            # A single member has no spread: it is the median, and its bands would be
+            # zero-width polygons
+            has_spread = member_values.shape[1] >= 2
+            if has_spread:
+                # Calculate all percentiles in one pass over the members
+                p10, p25, p50, p75, p90 = ensemble_quantiles(
+                    member_values, [0.10, 0.25, 0.50, 0.75, 0.90]
+                )
+            else:
+                p10 = p25 = p50 = p75 = p90 = member_values[:, 0]
             
-            # Add 25-75% band
-            fig.add_trace(go.Scatter(
-                x=x_data, 
-                y=p75,
-                mode='lines',
-                line=dict(width=0),
-                showlegend=False,
-                hoverinfo='skip',
-                name=f'{model}_p75'
-            ))
+            # Downsample every percentile on the same x-grid (picked from the outer
+            # envelope) so the bands and median stay aligned
+            idx = None
+            if max_points and len(p50) > max_points:
+                idx_low = _downsample_indices(p10, max(max_points // 2, 1))
+                idx_high = _downsample_indices(p90, max(max_points // 2, 1))
+                idx = np.union1d(idx_low, idx_high)
+            band_x = _take(x_data, idx)
+            p10, p25, p50, p75, p90 = (_take(p, idx) for p in (p10, p25, p50, p75, p90))
             
-            fig.add_trace(go.Scatter(
-                x=x_data, 
-                y=p25,
-                mode='lines',
-                line=dict(width=0),
-                fillcolor=hex_to_rgba(color, 0.2),
-                fill='tonexty',
-                name=f'{model} 25-75%',
-                hoverinfo='skip'
-            ))
+            # Each band is one closed polygon: along the upper bound, back along the lower
+            bands = ((p90, p10, 0.1, '10-90%'), (p75, p25, 0.2, '25-75%')) if has_spread else ()
+            for upper, lower, alpha, label in bands:
+                poly_x, poly_y = _band_polygon(band_x, upper, lower)
+                traces.append(dict(
+                    type='scattergl',
+                    x=poly_x,
+                    y=poly_y,
+                    mode='lines',
+                    line=dict(width=0),
+                    fillcolor=hex_to_rgba(color, alpha),
+                    fill='toself',
+                    name=f'{model} {label}',
+                    legendgroup=model,
+                    hoverinfo='skip'
+                ))
             
             # Median line
-            fig.add_trace(go.Scatter(
-                x=x_data, 
+            traces.append(dict(
+                type='scattergl',
+                x=band_x, 
                 y=p50,
                 mode='lines',
                 name=f'{model} Median',
+                legendgroup=model,
                 line=dict(color=color, width=2)
             ))
         
         if show_members:
-            # Show individual ensemble members as thin lines
-            for i, col in enumerate(model_cols):
-                fig.add_trace(go.Scatter(
-                    x=x_data, 
-                    y=df_plot[col],
-                    mode='lines',
-                    name=f'{model} Member {i+1}',
-                    line=dict(color=color, width=0.5),
-                    opacity=0.3,
-                    showlegend=(i == 0)  # Only show first member in legend
-                ))
+            # Show individual ensemble members as thin lines, batched into one WebGL trace
+            member_x, member_y = _stack_members(x_data, member_values)
+            traces.append(dict(
+                type='scattergl',
+                x=member_x,
+                y=member_y,
+                mode='lines',
+                name=f'{model} Members',
+                legendgroup=model,
+                line=dict(color=color, width=0.5),
+                opacity=0.3
+            ))
+    
+    # Nothing to draw: skip the layout, observation and marker work
+    if not traces and (df_obs is None or df_obs.empty):
+        return go.Figure(layout=dict(title='No data'))
     
     # Add observation data if available
     if df_obs is not None and not df_obs.empty:
-        df_obs_plot = df_obs.copy()
-        
-        # Convert observation times to specified timezone
-        try:
-            tz = pytz.timezone(timezone)
-            if 'datetime' in df_obs_plot.columns:
-                if pd.api.types.is_datetime64_any_dtype(df_obs_plot['datetime']):
-                    # Check if already timezone-aware
-                    if df_obs_plot['datetime'].dt.tz is None:
-                        # Localize to UTC first, then convert
-                        df_obs_plot['datetime'] = df_obs_plot['datetime'].dt.tz_localize('UTC').dt.tz_convert(tz)
-                    else:
-                        # Already timezone-aware, just convert
-                        df_obs_plot['datetime'] = df_obs_plot['datetime'].dt.tz_convert(tz)
-            elif isinstance(df_obs_plot.index, pd.DatetimeIndex):
-                if df_obs_plot.index.tz is None:
-                    df_obs_plot.index = df_obs_plot.index.tz_localize('UTC').tz_convert(tz)
-                else:
-                    # Already timezone-aware, just convert
-                    df_obs_plot.index = df_obs_plot.index.tz_convert(tz)
-        except Exception as e:
-            print(f"Warning: Could not convert observation timezone: {e}")
-            pass  # If conversion fails, use original timezone
-        
-        if variable in df_obs_plot.columns:
-            # Use datetime column if available, otherwise use index
-            if 'datetime' in df_obs_plot.columns:
-                x_data = df_obs_plot['datetime']
-            else:
-                x_data = df_obs_plot.index
-            
-            fig.add_trace(go.Scatter(
-                x=x_data,
-                y=df_obs_plot[variable],
+        if variable in df_obs.columns:
+            # Observation times in the specified timezone (datetime column, else index)
+            traces.append(dict(
+                type='scatter',
+                x=_obs_times(df_obs, tz),
+                y=df_obs[variable],
                 mode='markers',
                 name='Observations',
                 marker=dict(color='black', size=5, symbol='circle'),
                 line=dict(color='black', width=2)
             ))
     
-    fig.update_layout(
+    layout = dict(
+        _BASE_LAYOUT,
         title=f'Ensemble Forecast - {get_yaxis_title(variable)}',
         yaxis_title=get_yaxis_title(variable),
-        xaxis=dict(showgrid=True, title='Forecast Time'),
-        yaxis=dict(showgrid=True),
-        hovermode="x unified",
-        margin=dict(l=30, r=30, t=30, b=30),
-        template="simple_white",
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=-0.3,
-            xanchor="left",
-            x=0
-        )
+        # Each model's traces share a legend group; clicks still toggle single items
+        legend=dict(_BOTTOM_LEGEND, groupclick="toggleitem")
     )
     
-    # Add vertical line for current time
-    try:
-        tz = pytz.timezone(timezone)
-        current_time = datetime.now(tz)
-        
-        # Add vertical line using shape
-        fig.add_shape(
-            type="line",
-            x0=current_time,
-            x1=current_time,
-            y0=0,
-            y1=1,
-            yref="paper",
-            line=dict(
-                color="red",
-                width=2,
-                dash="dash"
-            )
-        )
-        
-        # Add annotation for the line
-        fig.add_annotation(
-            x=current_time,
-            y=1.02,
-            yref="paper",
-            text="Now",
-            showarrow=False,
-            font=dict(color="red", size=12),
-            xanchor="left"
-        )
-    except Exception as e:
-        # Fallback to UTC if timezone fails
-        try:
-            current_time = datetime.now(pytz.UTC)
-            fig.add_shape(
-                type="line",
-                x0=current_time,
-                x1=current_time,
-                y0=0,
-                y1=1,
-                yref="paper",
-                line=dict(
-                    color="red",
-                    width=2,
-                    dash="dash"
-                )
-            )
-            fig.add_annotation(
-                x=current_time,
-                y=1.02,
-                yref="paper",
-                text="Now (UTC)",
-                showarrow=False,
-                font=dict(color="red", size=12),
-                xanchor="left"
-            )
-        except Exception:
-            pass  # If this also fails, skip the current time line
-    
-    # Add horizontal threshold lines if provided
+    # Horizontal threshold lines and the current-time line go straight into the
+    # layout rather than one add_shape/add_annotation call each
+    shapes = []
+    annotations = []
     if thresholds:
-        threshold_colors = ['orange', 'purple', 'brown']  # Different colors for different thresholds
         for i, threshold in enumerate(thresholds):
-            color = threshold_colors[i % len(threshold_colors)]
-            
-            # Add horizontal line
-            fig.add_shape(
+            color = _THRESHOLD_COLORS[i % len(_THRESHOLD_COLORS)]
+            shapes.append(dict(
                 type="line",
                 x0=0,
                 x1=1,
                 xref="paper",
                 y0=threshold,
                 y1=threshold,
-                line=dict(
-                    color=color,
-                    width=2,
-                    dash="dot"
-                )
-            )
-            
-            # Add annotation for the threshold
-            fig.add_annotation(
-                x=1.01,
-                xref="paper",
+                line=dict(color=color, **_THRESHOLD_LINE_STYLE)
+            ))
+            annotations.append(dict(
                 y=threshold,
                 text=f"Threshold: {threshold}",
-                showarrow=False,
                 font=dict(color=color, size=10),
-                xanchor="left",
-                yanchor="middle"
-            )
+                **_THRESHOLD_LABEL_STYLE
+            ))
     
-    return fig
+    # Vertical line for current time
+    now_shape, now_annotation = _now_marker(tz, now_label)
+    shapes.append(now_shape)
+    annotations.append(now_annotation)
+    layout['shapes'] = shapes
+    layout['annotations'] = annotations
+    
+    return go.Figure(data=traces, layout=layout)
 
 
 def create_exceedance_plot(
@@ -605,7 +805,7 @@ def create_exceedance_plot(
     Returns:
         Plotly Figure object
     """
-    fig = go.Figure()
+    traces = []
     
     # Define line styles for different thresholds
     line_styles = ['solid', 'dash', 'dot', 'dashdot']
@@ -619,41 +819,45 @@ def create_exceedance_plot(
         # Fallback to integer index if no datetime found
         x_data = df.index
     
+    # One naive datetime64 array of wall-clock times for every trace (see _wall_times)
+    x_data = _wall_times(x_data)
+    
+    # Resolve the (model, threshold) columns present in the frame once, up front
+    available = set(df.columns)
+    exceed_cols = {}
+    for model in models:
+        for threshold in thresholds:
+            col_name = f'{model}_{variable}_exceed_{threshold}'
+            if col_name in available:
+                exceed_cols[(model, threshold)] = col_name
+    
     for threshold_idx, threshold in enumerate(thresholds):
         line_style = line_styles[threshold_idx % len(line_styles)]
         
         for model in models:
-            col_name = f'{model}_{variable}_exceed_{threshold}'
+            col_name = exceed_cols.get((model, threshold))
             
-            if col_name in df.columns:
+            if col_name is not None:
                 color = color_map.get(model, 'gray')
                 
-                fig.add_trace(go.Scatter(
+                traces.append(dict(
+                    type='scatter',
                     x=x_data,
                     y=df[col_name],
                     mode='lines',
                     name=f'{model} > {threshold}',
                     line=dict(color=color, dash=line_style, width=2),
-                    hovertemplate=f'{model}<br>Threshold: {threshold}<br>Probability: %{{y:.1f}}%<extra></extra>'
+                    hovertemplate=f'{model}<br>Threshold: {threshold}{_EXCEEDANCE_HOVER_SUFFIX}'
                 ))
     
-    fig.update_layout(
+    layout = dict(
+        _BASE_LAYOUT,
         title=f'Exceedance Probability - {get_yaxis_title(variable)}',
         yaxis_title='Probability of Exceedance (%)',
-        xaxis=dict(showgrid=True, title='Forecast Time'),
         yaxis=dict(showgrid=True, range=[0, 100]),
-        hovermode="x unified",
-        margin=dict(l=30, r=30, t=30, b=30),
-        template="simple_white",
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=-0.3,
-            xanchor="left",
-            x=0,
-            font=dict(size=10)
-        )
+        legend=dict(_BOTTOM_LEGEND, font=dict(size=10))
     )
+    fig = go.Figure(data=traces, layout=layout)
     
     # Add horizontal reference lines at 10%, 50%, 90%
     for prob in [10, 50, 90]:
@@ -678,6 +882,8 @@ def create_ensemble_spaghetti_plot(
     """
     Create a 'spaghetti plot' showing all ensemble members as individual lines
     
+    Members are batched into one WebGL (Scattergl) trace so large ensembles render quickly.
+    
     Args:
         df: DataFrame with ensemble data
         variable: Variable name to plot
@@ -687,14 +893,13 @@ def create_ensemble_spaghetti_plot(
     Returns:
         Plotly Figure object
     """
-    fig = go.Figure()
+    traces = []
     
     # Find all member columns
-    member_cols = [col for col in df.columns 
-                  if variable in col and model in col and '_member_' in col]
+    member_cols = [col for col in df.columns if col.startswith(f'{variable}_{model}_member_')]
     
     if not member_cols:
-        return fig
+        return go.Figure()
     
     # Ensure we have datetime data for x-axis
     if 'datetime' in df.columns:
@@ -705,23 +910,28 @@ def create_ensemble_spaghetti_plot(
         # Fallback to integer index if no datetime found
         x_data = df.index
     
-    # Add each member as a thin line
-    for i, col in enumerate(member_cols):
-        fig.add_trace(go.Scatter(
-            x=x_data,
-            y=df[col],
-            mode='lines',
-            name=f'Member {i+1}',
-            line=dict(color=color, width=1),
-            opacity=0.4,
-            showlegend=(i < 5)  # Only show first 5 in legend to avoid clutter
-        ))
+    # One naive datetime64 array of wall-clock times for every trace (see _wall_times)
+    x_data = _wall_times(x_data)
     
-    # Add ensemble mean as thick line
     ensemble_data = df[member_cols]
+    
+    # Add the members as thin lines, batched into one trace
+    member_x, member_y = _stack_members(x_data, ensemble_data.to_numpy(dtype=np.float32))
+    traces.append(dict(
+        type='scattergl',
+        x=member_x,
+        y=member_y,
+        mode='lines',
+        name='Members',
+        line=dict(color=color, width=1),
+        opacity=0.4
+    ))
+    
+    # Add ensemble mean as thick line
     ensemble_mean = ensemble_data.mean(axis=1)
     
-    fig.add_trace(go.Scatter(
+    traces.append(dict(
+        type='scattergl',
         x=x_data,
         y=ensemble_mean,
         mode='lines',
@@ -730,14 +940,11 @@ def create_ensemble_spaghetti_plot(
         opacity=1.0
     ))
     
-    fig.update_layout(
+    layout = dict(
+        _BASE_LAYOUT,
         title=f'Ensemble Members - {model} - {get_yaxis_title(variable)}',
-        yaxis_title=get_yaxis_title(variable),
-        xaxis=dict(showgrid=True, title='Forecast Time'),
-        yaxis=dict(showgrid=True),
-        hovermode="x unified",
-        margin=dict(l=30, r=30, t=30, b=30),
-        template="simple_white"
+        yaxis_title=get_yaxis_title(variable)
     )
+    fig = go.Figure(data=traces, layout=layout)
     
     return fig
\ No newline at end of file
@@ -1,16 +1,138 @@
 # File: utils/probability.py
 """Probability calculations for ensemble forecasts"""
 
+import warnings
 import pandas as pd
 import numpy as np
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+# numba compiles a parallel per-time-step quantile kernel for large ensembles; optional
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# Below this many values the NumPy path is already fast and skips numba's call overhead
+NUMBA_MIN_SIZE = 50_000
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _quantiles_kernel(values, quantiles):
+        """Per-row NaN-skipping linear quantiles, one row per thread chunk"""
+        n_times = values.shape[0]
+        out = np.full((quantiles.shape[0], n_times), np.nan)
+        for t in prange(n_times):
+            row = values[t]
+            row = np.sort(row[~np.isnan(row)])
+            n = row.shape[0]
+            if n == 0:
+                continue
+            for j in range(quantiles.shape[0]):
+                rank = quantiles[j] * (n - 1)
+                lower = int(np.floor(rank))
+                upper = min(lower + 1, n - 1)
+                out[j, t] = row[lower] + (row[upper] - row[lower]) * (rank - lower)
+        return out
+else:
+    _quantiles_kernel = None
+
+
+def index_member_columns(columns) -> Dict[str, List[str]]:
+    """
+    Group ensemble member columns by their '{variable}_{model}' prefix in one pass
+    
+    Args:
+        columns: Column names following the 'variable_model_member_XX' convention
+    
+    Returns:
+        Dictionary mapping 'variable_model' to its member columns (in column order)
+    
+    Example:
+        >>> index_member_columns(df.columns)['temperature_2m_gfs_ensemble']
+        ['temperature_2m_gfs_ensemble_member_00', 'temperature_2m_gfs_ensemble_member_01', ...]
+    """
+    index = {}
+    for col in columns:
+        prefix, sep, _ = col.partition('_member_')
+        if sep:
+            index.setdefault(prefix, []).append(col)
+    return index
+
+
+def ensemble_tensor(df: pd.DataFrame, variable: str, models: List[str]) -> np.ndarray:
+    """
+    Reshape ensemble member columns into one (time, model, member) float32 array
+    
+    Models with fewer members than the largest ensemble are padded with NaN; a model
+    without any columns for the variable is all NaN.
+    
+    Args:
+        df: DataFrame with ensemble data (columns like 'variable_model_member_00')
+        variable: Variable name to extract (e.g., 'temperature_2m')
+        models: List of ensemble model names, in the order of the model axis
+    
+    Returns:
+        Array of shape (len(df), len(models), max members per model)
+    
+    Example:
+        >>> data = ensemble_tensor(df, 'temperature_2m', ['gfs_ensemble', 'ecmwf_ifs_ensemble'])
+        >>> data[:, 0, :]  # GFS members
+    """
+    member_index = index_member_columns(df.columns)
+    model_cols = [member_index.get(f'{variable}_{model}', []) for model in models]
+    n_members = max((len(cols) for cols in model_cols), default=0)
+    
+    data = np.full((len(df), len(models), n_members), np.nan, dtype=np.float32)
+    for m, cols in enumerate(model_cols):
+        if cols:
+            data[:, m, :len(cols)] = df[cols].to_numpy(dtype=np.float32)
+    return data
+
+
+def ensemble_quantiles(values: np.ndarray, quantiles: List[float]) -> np.ndarray:
+    """
+    Quantiles across ensemble members for every time step (linear interpolation)
+    
+    All quantiles come from one pass: with numba installed, large arrays go through a
+    compiled parallel kernel. Otherwise, without NaNs only the order statistics needed
+    are selected with np.partition instead of sorting every row. NaNs are skipped
+    like DataFrame.quantile via the slower np.nanquantile; all-NaN time steps give NaN.
+    
+    Args:
+        values: Array of shape (time, member)
+        quantiles: Quantiles to compute (0-1)
+    
+    Returns:
+        Array of shape (len(quantiles), time)
+    
+    Example:
+        >>> p10, p50, p90 = ensemble_quantiles(df[model_cols].to_numpy(dtype=float), [0.1, 0.5, 0.9])
+    """
+    n_members = values.shape[1]
+    if _quantiles_kernel is not None and n_members > 0 and values.size >= NUMBA_MIN_SIZE:
+        return _quantiles_kernel(values, np.asarray(quantiles, dtype=np.float64))
+    
+    if n_members == 0 or np.isnan(values).any():
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            return np.nanquantile(values, quantiles, axis=1)
+    
+    # Fractional rank of each quantile, and the two order statistics around it
+    rank = np.asarray(quantiles) * (n_members - 1)
+    lower = np.floor(rank).astype(int)
+    upper = np.ceil(rank).astype(int)
+    part = np.partition(values, np.union1d(lower, upper), axis=1)
+    low_values = part[:, lower]
+    return (low_values + (part[:, upper] - low_values) * (rank - lower)).T
 
 
 def calculate_exceedance_probability(
     df: pd.DataFrame, 
     variable: str, 
     threshold: float,
-    models: List[str]
+    models: List[str],
+    member_index: Optional[Dict[str, List[str]]] = None
 ) -> pd.DataFrame:
     """
     Calculate probability of exceeding threshold across ensemble members
@@ -23,6 +145,8 @@ def calculate_exceedance_probability(
         variable: Variable name to analyze (e.g., 'temperature_2m')
         threshold: Threshold value to test against
         models: List of ensemble model names (e.g., ['gfs_ensemble', 'ecmwf_ifs_ensemble'])
+        member_index: Optional index_member_columns(df.columns), to share one index
+            across several calls on the same frame
     
     Returns:
         DataFrame with exceedance probabilities (0-100%) for each model
@@ -39,12 +163,13 @@ def calculate_exceedance_probability(
         >>> # with values 0-100 indicating percentage of members exceeding 30°C
     """
     result_df = pd.DataFrame(index=df.index)
+    if member_index is None:
+        member_index = index_member_columns(df.columns)
     
     for model in models:
         # Get all columns for this model and variable
         # Example: 'temperature_2m_gfs_ensemble_member_00', '_01', etc.
-        model_cols = [col for col in df.columns 
-                     if variable in col and model in col and '_member_' in col]
+        model_cols = member_index.get(f'{variable}_{model}', [])
         
         if model_cols:
             # Extract ensemble data for all members
@@ -64,7 +189,8 @@ def calculate_percentiles(
     df: pd.DataFrame,
     variable: str,
     model: str,
-    percentiles: List[int] = [10, 25, 50, 75, 90]
+    percentiles: List[int] = [10, 25, 50, 75, 90],
+    member_index: Optional[Dict[str, List[str]]] = None
 ) -> pd.DataFrame:
     """
     Calculate percentiles across ensemble members at each time step
@@ -74,6 +200,8 @@ def calculate_percentiles(
         variable: Variable name to analyze
         model: Model name
         percentiles: List of percentiles to calculate (0-100)
+        member_index: Optional index_member_columns(df.columns), to share one index
+            across several calls on the same frame
     
     Returns:
         DataFrame with percentile values
@@ -90,15 +218,18 @@ def calculate_percentiles(
     result_df = pd.DataFrame(index=df.index)
     
     # Get all columns for this model and variable
-    model_cols = [col for col in df.columns 
-                 if variable in col and model in col and '_member_' in col]
+    if member_index is None:
+        member_index = index_member_columns(df.columns)
+    model_cols = member_index.get(f'{variable}_{model}', [])
     
     if model_cols:
-        ensemble_data = df[model_cols]
+        # Calculate every percentile at each time step in one pass over the members
+        values = ensemble_quantiles(
+            df[model_cols].to_numpy(dtype=float), [p/100 for p in percentiles]
+        )
         
-        for p in percentiles:
-            # Calculate percentile at each time step
-            result_df[f'{model}_{variable}_p{p}'] = ensemble_data.quantile(p/100, axis=1)
+        for p, p_values in zip(percentiles, values):
+            result_df[f'{model}_{variable}_p{p}'] = p_values
     
     return result_df
 
@@ -106,7 +237,8 @@ def calculate_percentiles(
 def calculate_ensemble_statistics(
     df: pd.DataFrame,
     variable: str,
-    model: str
+    model: str,
+    member_index: Optional[Dict[str, List[str]]] = None
 ) -> pd.DataFrame:
     """
     Calculate comprehensive ensemble statistics
@@ -115,6 +247,8 @@ def calculate_ensemble_statistics(
         df: DataFrame with ensemble data
         variable: Variable name to analyze
         model: Model name
+        member_index: Optional index_member_columns(df.columns), to share one index
+            across several calls on the same frame
     
     Returns:
         DataFrame with mean, std, min, max, and quartiles
@@ -126,24 +260,34 @@ def calculate_ensemble_statistics(
     result_df = pd.DataFrame(index=df.index)
     
     # Get all ensemble member columns
-    model_cols = [col for col in df.columns 
-                 if variable in col and model in col and '_member_' in col]
+    if member_index is None:
+        member_index = index_member_columns(df.columns)
+    model_cols = member_index.get(f'{variable}_{model}', [])
     
     if not model_cols:
         return result_df
     
-    ensemble_data = df[model_cols]
-    
-    # Calculate statistics
-    result_df[f'{model}_{variable}_mean'] = ensemble_data.mean(axis=1)
-    result_df[f'{model}_{variable}_std'] = ensemble_data.std(axis=1)
-    result_df[f'{model}_{variable}_min'] = ensemble_data.min(axis=1)
-    result_df[f'{model}_{variable}_q25'] = ensemble_data.quantile(0.25, axis=1)
-    result_df[f'{model}_{variable}_median'] = ensemble_data.quantile(0.50, axis=1)
-    result_df[f'{model}_{variable}_q75'] = ensemble_data.quantile(0.75, axis=1)
-    result_df[f'{model}_{variable}_max'] = ensemble_data.max(axis=1)
-    
-    return result_df
+    values = df[model_cols].to_numpy(dtype=float)
+    
+    # Min and max are the 0 and 1 quantiles, so one pass gives all five order statistics
+    minimum, q25, median, q75, maximum = ensemble_quantiles(values, [0.0, 0.25, 0.50, 0.75, 1.0])
+    
+    # NaN-skipping like the pandas reductions; all-NaN time steps give NaN
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean = np.nanmean(values, axis=1)
+        std = np.nanstd(values, axis=1, ddof=1)
+    
+    # Assemble all columns at once
+    return pd.DataFrame({
+        f'{model}_{variable}_mean': mean,
+        f'{model}_{variable}_std': std,
+        f'{model}_{variable}_min': minimum,
+        f'{model}_{variable}_q25': q25,
+        f'{model}_{variable}_median': median,
+        f'{model}_{variable}_q75': q75,
+        f'{model}_{variable}_max': maximum
+    }, index=df.index)
 
 
 def calculate_probability_between_thresholds(
@@ -151,7 +295,8 @@ def calculate_probability_between_thresholds(
     variable: str,
     lower_threshold: float,
     upper_threshold: float,
-    models: List[str]
+    models: List[str],
+    member_index: Optional[Dict[str, List[str]]] = None
 ) -> pd.DataFrame:
     """
     Calculate probability of values falling between two thresholds
@@ -162,6 +307,8 @@ def calculate_probability_between_thresholds(
         lower_threshold: Lower bound
         upper_threshold: Upper bound
         models: List of model names
+        member_index: Optional index_member_columns(df.columns), to share one index
+            across several calls on the same frame
     
     Returns:
         DataFrame with probabilities (0-100%)
@@ -173,10 +320,11 @@ def calculate_probability_between_thresholds(
         ... )
     """
     result_df = pd.DataFrame(index=df.index)
+    if member_index is None:
+        member_index = index_member_columns(df.columns)
     
     for model in models:
-        model_cols = [col for col in df.columns 
-                     if variable in col and model in col and '_member_' in col]
+        model_cols = member_index.get(f'{variable}_{model}', [])
         
         if model_cols:
             ensemble_data = df[model_cols]
@@ -193,7 +341,8 @@ def calculate_probability_between_thresholds(
 def calculate_ensemble_spread(
     df: pd.DataFrame,
     variable: str,
-    model: str
+    model: str,
+    member_index: Optional[Dict[str, List[str]]] = None
 ) -> pd.DataFrame:
     """
     Calculate ensemble spread (standard deviation and range)
@@ -204,14 +353,17 @@ def calculate_ensemble_spread(
         df: DataFrame with ensemble data
         variable: Variable name
         model: Model name
+        member_index: Optional index_member_columns(df.columns), to share one index
+            across several calls on the same frame
     
     Returns:
         DataFrame with spread metrics
     """
     result_df = pd.DataFrame(index=df.index)
     
-    model_cols = [col for col in df.columns 
-                 if variable in col and model in col and '_member_' in col]
+    if member_index is None:
+        member_index = index_member_columns(df.columns)
+    model_cols = member_index.get(f'{variable}_{model}', [])
     
     if not model_cols:
         return result_df
@@ -227,9 +379,8 @@ def calculate_ensemble_spread(
     )
     
     # Interquartile range (75th - 25th percentile)
-    result_df[f'{model}_{variable}_spread_iqr'] = (
-        ensemble_data.quantile(0.75, axis=1) - ensemble_data.quantile(0.25, axis=1)
-    )
+    q25, q75 = ensemble_quantiles(ensemble_data.to_numpy(dtype=float), [0.25, 0.75])
+    result_df[f'{model}_{variable}_spread_iqr'] = q75 - q25
     
     return result_df
 
@@ -238,7 +389,8 @@ def calculate_risk_category_probabilities(
     df: pd.DataFrame,
     variable: str,
     thresholds: Dict[str, float],
-    models: List[str]
+    models: List[str],
+    member_index: Optional[Dict[str, List[str]]] = None
 ) -> pd.DataFrame:
     """
     Calculate probabilities for predefined risk categories
@@ -249,6 +401,8 @@ def calculate_risk_category_probabilities(
         thresholds: Dictionary of category names to threshold values
                    e.g., {'low': 20, 'medium': 30, 'high': 40}
         models: List of model names
+        member_index: Optional index_member_columns(df.columns), to share one index
+            across several calls on the same frame
     
     Returns:
         DataFrame with probability for each risk category
@@ -268,10 +422,11 @@ def calculate_risk_category_probabilities(
     
     # Sort thresholds
     sorted_categories = sorted(thresholds.items(), key=lambda x: x[1])
+    if member_index is None:
+        member_index = index_member_columns(df.columns)
     
     for model in models:
-        model_cols = [col for col in df.columns 
-                     if variable in col and model in col and '_member_' in col]
+        model_cols = member_index.get(f'{variable}_{model}', [])
         
         if not model_cols:
             continue
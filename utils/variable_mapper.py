@@ -8,9 +8,141 @@ the same physical meaning (e.g., temperature, wind speed) are properly recognize
 and compared across different model sources (Open-Meteo, AWS API, etc.).
 """
 
+import sys
 from typing import Dict, List, Optional, Set
 
 
+# Canonical variable name → set of alternative names across sources
+CANONICAL_TO_ALTERNATIVES: Dict[str, Set[str]] = {
+    # Temperature
+    'temperature_2m': {
+        'temperature_2m', 't2', 'temp_2m', 'air_temperature_2m',
+        't2m', '2m_temperature', 'temp', 't', 'tas', 'air_temp'
+    },
+    'temperature_2m_max': {
+        'temperature_2m_max', 't2_max', 'tmax', 'temp_max',
+        '2m_temperature_max', 'temperature_max'
+    },
+    'temperature_2m_min': {
+        'temperature_2m_min', 't2_min', 'tmin', 'temp_min',
+        '2m_temperature_min', 'temperature_min'
+    },
+    'dewpoint_2m': {
+        'dewpoint_2m', 'd2', 'dewpoint', 'dew_point_2m',
+        'd2m', 'dwpt', 'dew_point'
+    },
+    
+    # Wind
+    'wind_speed_10m': {
+        'wind_speed_10m', 'ws10', 'wind_speed', 'wspd',
+        '10m_wind_speed', 'ws_10m', 'u10', 'v10', 'ws', 'wind'
+    },
+    'wind_direction_10m': {
+        'wind_direction_10m', 'wd10', 'wind_direction', 'wdir',
+        '10m_wind_direction', 'wd_10m', 'wd', 'wdir_10m'
+    },
+    'wind_gusts_10m': {
+        'wind_gusts_10m', 'wg10', 'wind_gust_10m', 'wind_gusts',
+        'wpgt', 'gust_10m', 'gusts', 'gust', 'wg'
+    },
+    
+    # Precipitation
+    'precipitation': {
+        'precipitation', 'tp', 'total_precipitation', 'precip',
+        'prcp', 'rain', 'rainfall', 'pr', 'accum_precip'
+    },
+    'snowfall': {
+        'snowfall', 'snow', 'snow_depth', 'sf', 'snow_accum'
+    },
+    
+    # Humidity
+    'relative_humidity_2m': {
+        'relative_humidity_2m', 'rh2', 'rh_2m', 'humidity',
+        'rhum', 'rh', 'relative_humidity', 'hur', 'rel_hum'
+    },
+    
+    # Pressure
+    'pressure_msl': {
+        'pressure_msl', 'msl', 'mean_sea_level_pressure', 'pressure',
+        'mslp', 'pres', 'sea_level_pressure', 'slp', 'pmsl', 'psl'
+    },
+    'surface_pressure': {
+        'surface_pressure', 'sp', 'sfc_pressure', 'ps', 'sfc_pres'
+    },
+    
+    # Cloud and Radiation
+    'cloud_cover': {
+        'cloud_cover', 'tcc', 'total_cloud_cover', 'cloudcover',
+        'cloud', 'clouds', 'cld', 'clt'
+    },
+    'cloud_cover_low': {
+        'cloud_cover_low', 'lcc', 'low_cloud_cover', 'low_cloud'
+    },
+    'cloud_cover_mid': {
+        'cloud_cover_mid', 'mcc', 'mid_cloud_cover', 'medium_cloud_cover', 'mid_cloud'
+    },
+    'cloud_cover_high': {
+        'cloud_cover_high', 'hcc', 'high_cloud_cover', 'high_cloud'
+    },
+    'shortwave_radiation': {
+        'shortwave_radiation', 'ssrd', 'solar_radiation', 'sr',
+        'surface_solar_radiation', 'swr', 'ghi',
+        'sw_dn_avg', 'sw_dn', 'surface_global_irradiance',
+        'downwelling_shortwave', 'ghi_avg', 'swdown', 'rsds',
+        'global_horizontal_irradiance', 'sw_radiation'
+    },
+    'direct_radiation': {
+        'direct_radiation', 'direct_normal_irradiance', 'dni',
+        'beam_radiation', 'dni_avg', 'sw_dir', 'direct_solar'
+    },
+    'diffuse_radiation': {
+        'diffuse_radiation', 'diffuse_horizontal_irradiance', 'dhi',
+        'diffuse_solar_radiation', 'dhi_avg', 'sw_diff', 'diffuse_solar'
+    },
+    'longwave_radiation': {
+        'longwave_radiation', 'lw_dn', 'lw_down', 'lwdown',
+        'longwave_down', 'downwelling_longwave', 'rlds'
+    },
+    
+    # Wave parameters (if applicable)
+    'wave_height': {
+        'wave_height', 'hs', 'significant_wave_height', 'swh',
+        'swell_wave_height'
+    },
+    'wave_period': {
+        'wave_period', 'tp', 'peak_wave_period', 'wave_period_peak'
+    },
+    'wave_direction': {
+        'wave_direction', 'wd', 'mean_wave_direction', 'mwd'
+    },
+    
+    # Other meteorological variables
+    'visibility': {
+        'visibility', 'vis', 'horizontal_visibility'
+    },
+    'cape': {
+        'cape', 'convective_available_potential_energy'
+    },
+    'lifted_index': {
+        'lifted_index', 'li'
+    },
+    'soil_temperature_0_to_7cm': {
+        'soil_temperature_0_to_7cm', 'st0_7', 'soil_temp_0_7'
+    },
+    'soil_moisture_0_to_7cm': {
+        'soil_moisture_0_to_7cm', 'sm0_7', 'soil_moisture_0_7'
+    },
+}
+
+# Reverse mapping: alternative name → canonical name, built once at import and shared by
+# every VariableMapper (lowered keys are new strings, so intern them like the literals)
+_REVERSE_MAP: Dict[str, str] = {
+    sys.intern(alt.lower()): canonical
+    for canonical, alternatives in CANONICAL_TO_ALTERNATIVES.items()
+    for alt in alternatives
+}
+
+
 class VariableMapper:
     """
     Centralized variable name mapping across different weather data sources.
@@ -25,135 +157,13 @@ class VariableMapper:
     """
     
     def __init__(self):
-        """Initialize variable mapper with canonical mappings"""
+        """Initialize variable mapper with the shared canonical mappings"""
         
         # Canonical variable name → List of alternative names across sources
-        self.canonical_to_alternatives: Dict[str, Set[str]] = {
-            # Temperature
-            'temperature_2m': {
-                'temperature_2m', 't2', 'temp_2m', 'air_temperature_2m',
-                't2m', '2m_temperature', 'temp', 't', 'tas', 'air_temp'
-            },
-            'temperature_2m_max': {
-                'temperature_2m_max', 't2_max', 'tmax', 'temp_max',
-                '2m_temperature_max', 'temperature_max'
-            },
-            'temperature_2m_min': {
-                'temperature_2m_min', 't2_min', 'tmin', 'temp_min',
-                '2m_temperature_min', 'temperature_min'
-            },
-            'dewpoint_2m': {
-                'dewpoint_2m', 'd2', 'dewpoint', 'dew_point_2m',
-                'd2m', 'dwpt', 'dew_point'
-            },
-            
-            # Wind
-            'wind_speed_10m': {
-                'wind_speed_10m', 'ws10', 'wind_speed', 'wspd',
-                '10m_wind_speed', 'ws_10m', 'u10', 'v10', 'ws', 'wind'
-            },
-            'wind_direction_10m': {
-                'wind_direction_10m', 'wd10', 'wind_direction', 'wdir',
-                '10m_wind_direction', 'wd_10m', 'wd', 'wdir_10m'
-            },
-            'wind_gusts_10m': {
-                'wind_gusts_10m', 'wg10', 'wind_gust_10m', 'wind_gusts',
-                'wpgt', 'gust_10m', 'gusts', 'gust', 'wg'
-            },
-            
-            # Precipitation
-            'precipitation': {
-                'precipitation', 'tp', 'total_precipitation', 'precip',
-                'prcp', 'rain', 'rainfall', 'pr', 'accum_precip'
-            },
-            'snowfall': {
-                'snowfall', 'snow', 'snow_depth', 'sf', 'snow_accum'
-            },
-            
-            # Humidity
-            'relative_humidity_2m': {
-                'relative_humidity_2m', 'rh2', 'rh_2m', 'humidity',
-                'rhum', 'rh', 'relative_humidity', 'hur', 'rel_hum'
-            },
-            
-            # Pressure
-            'pressure_msl': {
-                'pressure_msl', 'msl', 'mean_sea_level_pressure', 'pressure',
-                'mslp', 'pres', 'sea_level_pressure', 'slp', 'pmsl', 'psl'
-            },
-            'surface_pressure': {
-                'surface_pressure', 'sp', 'sfc_pressure', 'ps', 'sfc_pres'
-            },
-            
-            # Cloud and Radiation
-            'cloud_cover': {
-                'cloud_cover', 'tcc', 'total_cloud_cover', 'cloudcover',
-                'cloud', 'clouds', 'cld', 'clt'
-            },
-            'cloud_cover_low': {
-                'cloud_cover_low', 'lcc', 'low_cloud_cover', 'low_cloud'
-            },
-            'cloud_cover_mid': {
-                'cloud_cover_mid', 'mcc', 'mid_cloud_cover', 'medium_cloud_cover', 'mid_cloud'
-            },
-            'cloud_cover_high': {
-                'cloud_cover_high', 'hcc', 'high_cloud_cover', 'high_cloud'
-            },
-            'shortwave_radiation': {
-                'shortwave_radiation', 'ssrd', 'solar_radiation', 'sr',
-                'surface_solar_radiation', 'swr', 'ghi',
-                'sw_dn_avg', 'sw_dn', 'surface_global_irradiance',
-                'downwelling_shortwave', 'ghi_avg', 'swdown', 'rsds',
-                'global_horizontal_irradiance', 'sw_radiation'
-            },
-            'direct_radiation': {
-                'direct_radiation', 'direct_normal_irradiance', 'dni',
-                'beam_radiation', 'dni_avg', 'sw_dir', 'direct_solar'
-            },
-            'diffuse_radiation': {
-                'diffuse_radiation', 'diffuse_horizontal_irradiance', 'dhi',
-                'diffuse_solar_radiation', 'dhi_avg', 'sw_diff', 'diffuse_solar'
-            },
-            'longwave_radiation': {
-                'longwave_radiation', 'lw_dn', 'lw_down', 'lwdown',
-                'longwave_down', 'downwelling_longwave', 'rlds'
-            },
-            
-            # Wave parameters (if applicable)
-            'wave_height': {
-                'wave_height', 'hs', 'significant_wave_height', 'swh',
-                'swell_wave_height'
-            },
-            'wave_period': {
-                'wave_period', 'tp', 'peak_wave_period', 'wave_period_peak'
-            },
-            'wave_direction': {
-                'wave_direction', 'wd', 'mean_wave_direction', 'mwd'
-            },
-            
-            # Other meteorological variables
-            'visibility': {
-                'visibility', 'vis', 'horizontal_visibility'
-            },
-            'cape': {
-                'cape', 'convective_available_potential_energy'
-            },
-            'lifted_index': {
-                'lifted_index', 'li'
-            },
-            'soil_temperature_0_to_7cm': {
-                'soil_temperature_0_to_7cm', 'st0_7', 'soil_temp_0_7'
-            },
-            'soil_moisture_0_to_7cm': {
-                'soil_moisture_0_to_7cm', 'sm0_7', 'soil_moisture_0_7'
-            },
-        }
+        self.canonical_to_alternatives: Dict[str, Set[str]] = CANONICAL_TO_ALTERNATIVES
         
-        # Build reverse mapping: alternative name → canonical name
-        self.alternative_to_canonical: Dict[str, str] = {}
-        for canonical, alternatives in self.canonical_to_alternatives.items():
-            for alt in alternatives:
-                self.alternative_to_canonical[alt.lower()] = canonical
+        # Reverse mapping: alternative name → canonical name
+        self.alternative_to_canonical: Dict[str, str] = _REVERSE_MAP
     
     def to_canonical(self, variable_name: str) -> str:
         """